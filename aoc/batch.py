@@ -0,0 +1,134 @@
+import glob
+import json
+import re
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from aoc.runner import load_day, run_part
+
+
+DAY_NAME_RE = re.compile(r"^day(\d+)")
+
+
+def parse_manifest(lines) -> list[dict]:
+    """Jobs from JSON lines like {"day": 3, "part": 2, "input": "day3/input.txt"}.
+
+    Blank lines and lines starting with "#" are skipped.
+    """
+    jobs = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        job = json.loads(line)
+        jobs.append({"day": int(job["day"]), "part": int(job["part"]), "input": str(job["input"])})
+    return jobs
+
+
+def day_from_path(path) -> int:
+    """The day a path belongs to, from the nearest "dayN..." component."""
+    for part in reversed(Path(path).parts):
+        match = DAY_NAME_RE.match(part)
+        if match:
+            return int(match.group(1))
+    raise ValueError(f"Can't tell which day {path} is for")
+
+
+def jobs_from_glob(pattern: str, parts=None) -> list[dict]:
+    """One job per matching file and part; parts default to all of the day's.
+
+    A file for a day that can't be loaded still gets a job (with part None),
+    so the failure is reported with the rest of the batch.
+    """
+    jobs = []
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        day = day_from_path(path)
+        if not parts:
+            try:
+                day_parts = sorted(load_day(day).SOLVERS)
+            except Exception:
+                day_parts = [None]
+        for part in parts or day_parts:
+            jobs.append({"day": day, "part": part, "input": path})
+    return jobs
+
+
+def run_job(job: dict, cache=None) -> dict:
+    """Run one job, turning any failure into an error report."""
+    start = time.perf_counter_ns()
+    try:
+        report = run_part(job["day"], job["part"], job["input"], trace_memory=False, cache=cache)
+        report["ok"] = True
+    except Exception as exc:
+        report = _error_report(job, exc, traceback.format_exc())
+    report["wall_ns"] = time.perf_counter_ns() - start
+    if "job" in job:
+        report["job"] = job["job"]
+    return report
+
+
+def _error_report(job: dict, exc: BaseException, trace="") -> dict:
+    return dict(job, ok=False, error=f"{type(exc).__name__}: {exc}", traceback=trace, wall_ns=0)
+
+
+def run_chunk(jobs: list[dict], cache=None) -> list[dict]:
+    return [run_job(job, cache) for job in jobs]
+
+
+def _run_isolated(chunk: list[dict], cache=None) -> list[dict]:
+    """Run a chunk on a pool of its own, so a worker death is pinned on it."""
+    with ProcessPoolExecutor(1) as pool:
+        try:
+            return pool.submit(run_chunk, chunk, cache).result()
+        except BrokenProcessPool as exc:
+            return [_error_report(job, exc) for job in chunk]
+
+
+def run_batch(jobs: list[dict], workers=None, chunksize=1, cache=None):
+    """Run jobs on a process pool, yielding reports as they complete.
+
+    Jobs are sent to the workers chunksize at a time to cut down on
+    inter-process overhead. Every report carries a "job" index into jobs, as
+    reports arrive in completion order rather than submission order.
+
+    If a worker dies (killed for memory, a segfault), the pool is rebuilt and
+    every chunk it took down is run again. A chunk that is caught in a second
+    breakage is run on a pool of its own, and reported as failed only if it
+    kills that one too, so one bad input fails only its own jobs.
+    """
+    jobs = [dict(job, job=idx) for idx, job in enumerate(jobs)]
+    chunks = [jobs[start : start + chunksize] for start in range(0, len(jobs), chunksize)]
+    breakages = [0] * len(chunks)
+    # pending maps each future to its chunk and the generation of pool it ran on
+    generation = 0
+    pool = ProcessPoolExecutor(workers)
+    try:
+        pending = {pool.submit(run_chunk, chunk, cache): (idx, generation) for idx, chunk in enumerate(chunks)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            broken = []
+            for future in done:
+                idx, ran_on = pending.pop(future)
+                try:
+                    yield from future.result()
+                except BrokenProcessPool:
+                    broken.append((idx, ran_on))
+                except Exception as exc:
+                    yield from (_error_report(job, exc, traceback.format_exc()) for job in chunks[idx])
+            if not broken:
+                continue
+            if any(ran_on == generation for _, ran_on in broken):
+                pool.shutdown(wait=True)
+                pool = ProcessPoolExecutor(workers)
+                generation += 1
+            for idx, _ in broken:
+                breakages[idx] += 1
+                if breakages[idx] == 1:
+                    pending[pool.submit(run_chunk, chunks[idx], cache)] = (idx, generation)
+                else:
+                    yield from _run_isolated(chunks[idx], cache)
+    finally:
+        pool.shutdown(wait=True)
@@ -0,0 +1,225 @@
+import math
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from aoc.generators import BASE_SIZES, generate
+from aoc.runner import load_day, run_part
+from aoc.tables import format_rows
+
+
+DEFAULT_SCALES = (1, 10, 100, 1000)
+DEFAULT_WORKER_COUNTS = (1, 2, 4, 8)
+
+# scale of the generated day 1 block that bench_speedup repeats to size
+SPEEDUP_BLOCK_SCALE = 100
+
+
+def _reference_day1(data, part):
+    module = load_day(1)
+    total = 0
+    for line in data:
+        if part == 1:
+            digits = [char for char in line if char.isdigit()]
+        else:
+            digits = [
+                line[idx] if line[idx].isdigit() else module.string_matches_digit(line, idx)
+                for idx in range(len(line))
+            ]
+            digits = [digit for digit in digits if digit is not None]
+        total += int(digits[0] + digits[-1])
+    return total
+
+
+def _reference_day2(data, part):
+    module = load_day(2)
+    total = 0
+    for line in data:
+        game_id, reveals = module.parse_line(line)
+        maxima = defaultdict(int)
+        for reveal in reveals:
+            for color, number in reveal.items():
+                maxima[color] = max(maxima[color], number)
+        if part == 1:
+            if all(maxima[color] <= limit for color, limit in module.PART_ONE_CUBE_LIMITS.items()):
+                total += game_id
+        else:
+            total += math.prod(maxima.values())
+    return total
+
+
+def _reference_day3(data, part):
+    module = load_day(3)
+    total = 0
+    for ridx, line in enumerate(data):
+        if part == 1:
+            search_col = 0
+            while search_col is not None:
+                number_str, start_col, search_col = module.get_next_number(line, search_col)
+                if number_str is not None and module.is_part_number(ridx, start_col, len(number_str), data):
+                    total += int(number_str)
+        else:
+            for cidx, char in enumerate(line):
+                if char == "*":
+                    parts = module.get_contacted_parts(ridx, cidx, data)
+                    if len(parts) == 2:
+                        total += parts[0] * parts[1]
+    return total
+
+
+def _reference_day4(data, part):
+    module = load_day(4)
+    winners = [module.number_of_winners(*module.parse_line(line)) for line in data]
+    if part == 1:
+        return sum(2 ** (count - 1) for count in winners if count)
+    copies = [1] * len(winners)
+    for idx, count in enumerate(winners):
+        for won in range(idx + 1, min(idx + 1 + count, len(winners))):
+            copies[won] += copies[idx]
+    return sum(copies)
+
+
+def _reference_day5(data, part):
+    module = load_day(5)
+    seeds = module.get_seeds(data[0])
+    # the original parser and lookup: a list of triples per map, scanned in order
+    maps = defaultdict(list)
+    mode = None
+    for line in data[1:]:
+        if line and line[0].isnumeric():
+            maps[mode].append(module.get_numbers(line))
+        elif line:
+            mode = line[: line.index("-")]
+    if part == 2:
+        seeds = [seed for start, length in zip(seeds[0::2], seeds[1::2]) for seed in range(start, start + length)]
+    locations = []
+    for seed in seeds:
+        last_id = seed
+        for this_type in module.TYPES[:-1]:
+            for dest_start, src_start, length in maps[this_type]:
+                if src_start <= last_id < src_start + length:
+                    last_id = dest_start + (last_id - src_start)
+                    break
+        locations.append(last_id)
+    return min(locations)
+
+
+# straightforward implementations to check the optimized solvers against
+REFERENCE_SOLVERS = {
+    1: _reference_day1,
+    2: _reference_day2,
+    3: _reference_day3,
+    4: _reference_day4,
+    5: _reference_day5,
+}
+
+
+def reference_answer(day: int, part: int, input_file) -> int:
+    data = load_day(day).read_input(str(input_file))
+    return REFERENCE_SOLVERS[day](data, part)
+
+
+def bench_part(day: int, part: int, scales=DEFAULT_SCALES, seed=0, check_max_scale=10, workdir=None) -> list[dict]:
+    """Run one solver over generated inputs of increasing size.
+
+    Each report from run_part gets the scale, the input size, the throughput
+    and the scaling exponent against the previous rung (1.0 is linear). Rungs
+    up to check_max_scale are also checked against REFERENCE_SOLVERS.
+    """
+    reports = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for scale in scales:
+            input_file = Path(tmp) / f"day{day}-x{scale}.txt"
+            input_file.write_text(generate(day, scale, seed))
+            report = run_part(day, part, input_file, trace_memory=False)
+            report["scale"] = scale
+            report["input_bytes"] = input_file.stat().st_size
+            report["mb_per_s"] = report["input_bytes"] / 1e6 / (report["total_ns"] / 1e9)
+            if reports:
+                previous = reports[-1]
+                report["scaling"] = math.log(report["total_ns"] / previous["total_ns"]) / math.log(
+                    scale / previous["scale"]
+                )
+            if scale <= check_max_scale:
+                report["correct"] = report["answer"] == reference_answer(day, part, input_file)
+            reports.append(report)
+    return reports
+
+
+def bench_speedup(part: int, size_bytes: int, workers=DEFAULT_WORKER_COUNTS, chunk_size=None, seed=0, workdir=None) -> list[dict]:
+    """Time day 1's parallel file solver on one large input with more and more workers.
+
+    The input is a generated block repeated to at least size_bytes, so the
+    right answer is the block's answer times the number of repeats. Each
+    report gets the speed-up against the first worker count and the
+    efficiency, the speed-up over the ideal one for that many more workers
+    (1.0 is linear).
+    """
+    module = load_day(1)
+    chunk_size = chunk_size or module.PARALLEL_CHUNK_SIZE
+    block = generate(1, SPEEDUP_BLOCK_SCALE, seed).encode()
+    repeats = -(-size_bytes // len(block))
+    expected = module.BLOCK_SOLVERS[part](block) * repeats
+    reports = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        input_file = Path(tmp) / "day1-speedup.txt"
+        with open(input_file, "wb") as f:
+            for _ in range(repeats):
+                f.write(block)
+        for count in workers:
+            start = time.perf_counter_ns()
+            answer = module.parallel_calibration_total(input_file, part, count, chunk_size)
+            report = {
+                "day": 1,
+                "part": part,
+                "workers": count,
+                "input_bytes": len(block) * repeats,
+                "total_ns": time.perf_counter_ns() - start,
+                "correct": answer == expected,
+            }
+            report["mb_per_s"] = report["input_bytes"] / 1e6 / (report["total_ns"] / 1e9)
+            first = reports[0] if reports else report
+            report["speedup"] = first["total_ns"] / report["total_ns"]
+            report["efficiency"] = report["speedup"] / (count / first["workers"])
+            reports.append(report)
+    return reports
+
+
+def format_speedup_table(reports: list[dict]) -> str:
+    headers = ["day", "part", "workers", "input", "total", "MB/s", "speedup", "efficiency", "correct"]
+    rows = []
+    for report in reports:
+        rows.append(
+            [
+                str(report["day"]),
+                str(report["part"]),
+                str(report["workers"]),
+                f"{report['input_bytes'] / 1e6:.0f}MB",
+                f"{report['total_ns'] / 1e6:.1f}ms",
+                f"{report['mb_per_s']:.2f}",
+                f"{report['speedup']:.2f}",
+                f"{report['efficiency']:.2f}",
+                str(report["correct"]),
+            ]
+        )
+    return format_rows(headers, rows)
+
+
+def format_bench_table(reports: list[dict]) -> str:
+    headers = ["day", "part", "scale", "input", "total", "MB/s", "scaling", "correct"]
+    rows = []
+    for report in reports:
+        rows.append(
+            [
+                str(report["day"]),
+                str(report["part"]),
+                f"{report['scale']}x",
+                f"{report['input_bytes'] / 1e6:.2f}MB",
+                f"{report['total_ns'] / 1e6:.1f}ms",
+                f"{report['mb_per_s']:.2f}",
+                f"{report['scaling']:.2f}" if "scaling" in report else "-",
+                str(report["correct"]) if "correct" in report else "-",
+            ]
+        )
+    return format_rows(headers, rows)
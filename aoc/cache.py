@@ -0,0 +1,99 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("AOC_CACHE_DIR", Path.home() / ".cache" / "aoc"))
+DEFAULT_MAX_BYTES = 1024**3
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedCache:
+    """Content-addressed cache of parsed puzzle inputs.
+
+    Entries are keyed by the day, the day's PARSER_VERSION and a hash of the
+    input file, so editing either the input or the parser misses the cache.
+    Each entry is a directory of .npy files, one per array returned by the
+    day's dump_parsed(), which are memory-mapped back in on a hit and handed
+    to load_parsed(). Once the cache grows past max_bytes the least recently
+    used entries are evicted.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def key(self, day: int, module, input_file) -> str:
+        return f"day{day}-v{module.PARSER_VERSION}-{file_digest(input_file)}"
+
+    def get(self, key: str, module):
+        """The cached parse for key, or None on a miss."""
+        import numpy as np
+
+        entry = self.directory / key
+        if not entry.is_dir():
+            return None
+        arrays = {path.stem: np.load(path, mmap_mode="r") for path in entry.glob("*.npy")}
+        # a hit counts as a use for LRU eviction
+        os.utime(entry)
+        return module.load_parsed(arrays)
+
+    def put(self, key: str, module, parsed):
+        import numpy as np
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = self.directory / key
+        # written to the side and renamed, so readers never see half an entry
+        staging = Path(tempfile.mkdtemp(dir=self.directory, prefix=".staging-"))
+        try:
+            for name, value in module.dump_parsed(parsed).items():
+                np.save(staging / f"{name}.npy", np.asarray(value), allow_pickle=False)
+            os.rename(staging, entry)
+        except OSError:
+            # another process stored the same entry first
+            shutil.rmtree(staging, ignore_errors=True)
+            if not entry.is_dir():
+                raise
+        self.evict(keep=key)
+
+    def load_or_parse(self, day: int, module, input_file):
+        """Return (parsed input, whether it came from the cache)."""
+        key = self.key(day, module, input_file)
+        parsed = self.get(key, module)
+        if parsed is not None:
+            return parsed, True
+        parsed = module.parse_input(module.read_input(str(input_file)))
+        self.put(key, module, parsed)
+        return parsed, False
+
+    def entries(self) -> list[tuple[Path, int]]:
+        """(entry directory, size in bytes) pairs, least recently used first."""
+        if not self.directory.is_dir():
+            return []
+        entries = [path for path in self.directory.iterdir() if path.is_dir() and not path.name.startswith(".")]
+        entries.sort(key=lambda path: path.stat().st_mtime)
+        return [(path, sum(f.stat().st_size for f in path.iterdir())) for path in entries]
+
+    def evict(self, keep=None):
+        entries = self.entries()
+        total = sum(size for _, size in entries)
+        for path, size in entries:
+            if total <= self.max_bytes:
+                break
+            if path.name == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,309 @@
+import argparse
+import cProfile
+import json
+import os
+import sys
+
+from aoc.bench import (
+    DEFAULT_SCALES,
+    DEFAULT_WORKER_COUNTS,
+    bench_part,
+    bench_speedup,
+    format_bench_table,
+    format_speedup_table,
+)
+from aoc import profiling
+from aoc.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ParsedCache
+from aoc.generators import BASE_SIZES, generate
+from aoc.profiling import format_profile_table
+from aoc.runner import discover_days, format_table, load_day, run_part
+
+# batch, serve, client, loadtest and startup pull in multiprocessing, asyncio
+# or subprocess, so their modules are imported inside the command functions
+
+
+def run_command(args):
+    days = args.day or list(discover_days())
+    if args.input and len(days) != 1:
+        raise SystemExit("--input needs exactly one --day")
+    if args.profile or args.profile_out:
+        # set before any day is loaded, so load_day instruments them
+        os.environ[profiling.ENV_VAR] = "1"
+    cache = _cache_from_args(args)
+    reports = []
+    for day in days:
+        parts = args.part or sorted(load_day(day).SOLVERS)
+        for part in parts:
+            profiler = cProfile.Profile() if args.profile_out else None
+            report = run_part(
+                day, part, args.input, trace_memory=not args.no_memory, cache=cache, profiler=profiler
+            )
+            if profiler is not None:
+                os.makedirs(args.profile_out, exist_ok=True)
+                profiler.dump_stats(os.path.join(args.profile_out, f"day{day}-part{part}.pstats"))
+            if args.json:
+                print(json.dumps(report, default=int), flush=True)
+            reports.append(report)
+    if not args.json:
+        print(format_table(reports))
+    if profiling.enabled():
+        stats = profiling.PROFILER.stats()
+        if args.json:
+            for row in stats:
+                print(json.dumps(row), flush=True)
+        else:
+            print()
+            print(format_profile_table(stats))
+        if args.profile_out:
+            profiling.PROFILER.write_collapsed(os.path.join(args.profile_out, "collapsed.txt"))
+
+
+def _cache_from_args(args):
+    return ParsedCache(args.cache_dir, args.cache_max_mb * 1024**2) if args.cache else None
+
+
+def _add_cache_arguments(parser):
+    parser.add_argument("--cache", action="store_true", help="reuse parsed inputs from the parsed-input cache")
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="cache directory (default: $AOC_CACHE_DIR or ~/.cache/aoc)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=DEFAULT_MAX_BYTES // 1024**2,
+        help="evict least recently used entries past this size",
+    )
+
+
+def batch_command(args):
+    from aoc.batch import jobs_from_glob, parse_manifest, run_batch
+
+    jobs = []
+    if args.manifest == "-":
+        jobs += parse_manifest(sys.stdin)
+    elif args.manifest:
+        with open(args.manifest) as f:
+            jobs += parse_manifest(f)
+    for pattern in args.glob or []:
+        jobs += jobs_from_glob(pattern, args.part)
+    if not jobs:
+        raise SystemExit("no jobs; pass --manifest and/or --glob")
+
+    failures = 0
+    for report in run_batch(jobs, args.workers, args.chunksize, _cache_from_args(args)):
+        failures += not report["ok"]
+        print(json.dumps(report, default=int), flush=True)
+    if failures:
+        raise SystemExit(f"{failures} of {len(jobs)} jobs failed")
+
+
+def generate_command(args):
+    text = generate(args.day, args.scale, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+def bench_command(args):
+    reports = []
+    for day in args.day or sorted(BASE_SIZES):
+        for part in args.part or sorted(load_day(day).SOLVERS):
+            for report in bench_part(day, part, args.scales, args.seed, args.check_max_scale):
+                if args.json:
+                    print(json.dumps(report, default=int), flush=True)
+                reports.append(report)
+    if not args.json:
+        print(format_bench_table(reports))
+    if not all(report.get("correct", True) for report in reports):
+        raise SystemExit("some answers did not match the reference solvers")
+
+
+def speedup_command(args):
+    reports = []
+    for part in args.part or [1, 2]:
+        for report in bench_speedup(
+            part, args.size_mb * 1024 * 1024, args.workers, args.chunk_size, args.seed, args.workdir
+        ):
+            if args.json:
+                print(json.dumps(report, default=int), flush=True)
+            reports.append(report)
+    if not args.json:
+        print(format_speedup_table(reports))
+    if not all(report["correct"] for report in reports):
+        raise SystemExit("some answers were wrong")
+
+
+def startup_command(args):
+    from aoc.startup import check_startup, format_startup_table
+
+    reports = check_startup(repeat=args.repeat)
+    if args.json:
+        for report in reports:
+            print(json.dumps(report))
+    else:
+        print(format_startup_table(reports))
+    if not all(report["ok"] for report in reports):
+        raise SystemExit("some entry points are over their import-time budget")
+
+
+def _address_from_args(args) -> dict:
+    from aoc.server import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_SOCKET
+
+    if args.tcp:
+        return {"host": args.host or DEFAULT_HOST, "port": args.port or DEFAULT_PORT}
+    return {"socket_path": args.socket or DEFAULT_SOCKET}
+
+
+def _add_address_arguments(parser):
+    parser.add_argument("--socket", help="Unix socket path (default: aoc-solve.sock in the temp directory)")
+    parser.add_argument("--tcp", action="store_true", help="use localhost TCP instead of the Unix socket")
+    parser.add_argument("--host", help="TCP host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="TCP port (default: 8765)")
+
+
+def serve_command(args):
+    import asyncio
+
+    from aoc.server import serve
+
+    try:
+        asyncio.run(serve(workers=args.workers, **_address_from_args(args)))
+    except KeyboardInterrupt:
+        pass
+
+
+def client_command(args):
+    import asyncio
+
+    from aoc.client import SolveClient
+
+    async def solve():
+        client = await SolveClient.connect(**_address_from_args(args))
+        try:
+            if args.send_input:
+                with open(args.input) as f:
+                    return await client.solve(args.day, args.part, input_text=f.read())
+            return await client.solve(args.day, args.part, input_path=os.path.abspath(args.input))
+        finally:
+            await client.close()
+
+    response = asyncio.run(solve())
+    if args.json:
+        print(json.dumps(response))
+    elif response["ok"]:
+        print(response["answer"])
+    else:
+        raise SystemExit(response["error"])
+
+
+def loadtest_command(args):
+    import asyncio
+
+    from aoc.loadtest import run_load
+
+    job = {"day": args.day, "part": args.part, "input_path": os.path.abspath(args.input)}
+    summary = asyncio.run(run_load(_address_from_args(args), job, args.clients, args.requests, args.pipeline))
+    print(json.dumps(summary))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m aoc", description="Run Advent of Code solvers")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="solve puzzles and report where the time goes")
+    run.add_argument("--day", type=int, action="append", help="day to run (repeatable; default: all)")
+    run.add_argument("--part", type=int, action="append", help="part to run (repeatable; default: all)")
+    run.add_argument("--input", help="input file (default: dayN/input.txt)")
+    run.add_argument("--json", action="store_true", help="emit one JSON report per line instead of a table")
+    run.add_argument("--no-memory", action="store_true", help="skip tracemalloc, which slows the solvers down")
+    run.add_argument(
+        "--profile",
+        action="store_true",
+        help=f"count and time each day's HOT_FUNCTIONS (same as setting {profiling.ENV_VAR}=1)",
+    )
+    run.add_argument(
+        "--profile-out",
+        help="also write a cProfile .pstats file per run and collapsed stacks for flame graphs to this directory",
+    )
+    _add_cache_arguments(run)
+    run.set_defaults(func=run_command)
+
+    batch = commands.add_parser("batch", help="solve many (day, part, input) jobs on a process pool")
+    batch.add_argument("--manifest", help='JSON lines of {"day", "part", "input"} jobs, or - for stdin')
+    batch.add_argument("--glob", action="append", help="input files to run; the day comes from a dayN path component")
+    batch.add_argument("--part", type=int, action="append", help="parts to run for --glob inputs (default: all)")
+    batch.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    batch.add_argument("--chunksize", type=int, default=1, help="jobs sent to a worker at a time")
+    _add_cache_arguments(batch)
+    batch.set_defaults(func=batch_command)
+
+    gen = commands.add_parser("generate", help="write a synthetic puzzle input")
+    gen.add_argument("--day", type=int, required=True, choices=sorted(BASE_SIZES))
+    gen.add_argument("--scale", type=int, default=1, help="multiple of the real input's size")
+    gen.add_argument("--seed", type=int, default=0)
+    gen.add_argument("-o", "--output", help="output file (default: stdout)")
+    gen.set_defaults(func=generate_command)
+
+    bench = commands.add_parser("bench", help="run solvers over a ladder of generated input sizes")
+    bench.add_argument("--day", type=int, action="append", help="day to run (repeatable; default: all)")
+    bench.add_argument("--part", type=int, action="append", help="part to run (repeatable; default: all)")
+    bench.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument(
+        "--check-max-scale",
+        type=int,
+        default=10,
+        help="check answers against the reference solvers up to this scale",
+    )
+    bench.add_argument("--json", action="store_true", help="emit one JSON report per line instead of a table")
+    bench.set_defaults(func=bench_command)
+
+    speedup = commands.add_parser("speedup", help="time day 1's parallel file solver with more and more workers")
+    speedup.add_argument("--part", type=int, action="append", help="part to run (repeatable; default: both)")
+    speedup.add_argument("--size-mb", type=int, default=1024, help="size of the generated input in MiB")
+    speedup.add_argument("--workers", type=int, nargs="+", default=list(DEFAULT_WORKER_COUNTS))
+    speedup.add_argument("--chunk-size", type=int, help="bytes per worker range (default: day 1's PARALLEL_CHUNK_SIZE)")
+    speedup.add_argument("--seed", type=int, default=0)
+    speedup.add_argument("--workdir", help="directory for the generated input (default: the temp directory)")
+    speedup.add_argument("--json", action="store_true", help="emit one JSON report per line instead of a table")
+    speedup.set_defaults(func=speedup_command)
+
+    startup = commands.add_parser("startup", help="check solver import times against their budgets")
+    startup.add_argument("--repeat", type=int, default=3, help="imports per entry point; the fastest counts")
+    startup.add_argument("--json", action="store_true", help="emit one JSON report per line instead of a table")
+    startup.set_defaults(func=startup_command)
+
+    server = commands.add_parser("serve", help="run a local solve server with warm worker processes")
+    _add_address_arguments(server)
+    server.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    server.set_defaults(func=serve_command)
+
+    client = commands.add_parser("client", help="solve a puzzle on a running solve server")
+    _add_address_arguments(client)
+    client.add_argument("--day", type=int, required=True)
+    client.add_argument("--part", type=int, required=True)
+    client.add_argument("--input", required=True, help="input file")
+    client.add_argument("--send-input", action="store_true", help="send the input's contents instead of its path")
+    client.add_argument("--json", action="store_true", help="print the whole response, with timings")
+    client.set_defaults(func=client_command)
+
+    loadtest = commands.add_parser("loadtest", help="measure solve server throughput and latency")
+    _add_address_arguments(loadtest)
+    loadtest.add_argument("--day", type=int, required=True)
+    loadtest.add_argument("--part", type=int, required=True)
+    loadtest.add_argument("--input", required=True, help="input file")
+    loadtest.add_argument("--clients", type=int, default=4, help="concurrent connections")
+    loadtest.add_argument("--requests", type=int, default=100, help="requests per client")
+    loadtest.add_argument("--pipeline", type=int, default=8, help="requests each client keeps in flight")
+    loadtest.set_defaults(func=loadtest_command)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.func(args)
@@ -0,0 +1,60 @@
+import asyncio
+import itertools
+import json
+
+from aoc.server import DEFAULT_HOST, DEFAULT_PORT, MAX_REQUEST_BYTES
+
+
+class SolveClient:
+    """Pipelining client for SolveServer.
+
+    Any number of solve() calls can be in flight on one connection; a
+    background task matches responses to requests by id.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count()
+        self.pending = {}
+        self.receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        if socket_path:
+            reader, writer = await asyncio.open_unix_connection(socket_path, limit=MAX_REQUEST_BYTES)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_REQUEST_BYTES)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        while line := await self.reader.readline():
+            response = json.loads(line)
+            future = self.pending.pop(response["id"], None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self.pending.values():
+            future.set_exception(ConnectionError("server closed the connection"))
+
+    async def solve(self, day: int, part: int, input_path=None, input_text=None) -> dict:
+        """Send one request and wait for its response.
+
+        Pass input_path for a file the server can read, or input_text to send
+        the puzzle input itself.
+        """
+        request_id = next(self.ids)
+        request = {"id": request_id, "day": day, "part": part}
+        if input_text is not None:
+            request["input"] = input_text
+        else:
+            request["input_path"] = str(input_path)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.writer.write(json.dumps(request).encode() + b"\n")
+        await self.writer.drain()
+        return await future
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        self.receiver.cancel()
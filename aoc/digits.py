@@ -0,0 +1,39 @@
+import numpy as np
+
+
+ZERO = ord("0")
+
+# 10 ** places for every place an int64 can hold
+POWERS_OF_TEN = 10 ** np.arange(19, dtype=np.int64)
+
+
+def digit_runs(raw: np.ndarray) -> (np.ndarray, np.ndarray, np.ndarray):
+    """Find every run of ASCII digits in a flat uint8 array, and its value.
+
+    Runs are whatever digits are next to each other in raw, so a caller that
+    wants numbers to stop at a line's end has to keep a non-digit there.
+
+    Returns:
+        tuple of int64 arrays, one entry per run, in order:
+            start index
+            end index (exclusive)
+            value
+    """
+    digits = (raw >= ZERO) & (raw <= ZERO + 9)
+    first = digits.copy()
+    first[1:] &= ~digits[:-1]
+    last = digits.copy()
+    last[:-1] &= ~digits[1:]
+    cells = np.flatnonzero(digits)
+    firsts = first[cells]
+    starts = cells[firsts]
+    ends = np.flatnonzero(last) + 1
+    if not len(starts):
+        return starts, ends, np.zeros(0, dtype=np.int64)
+
+    # each digit contributes digit * 10 ** (places from the end of its run);
+    # counting the run starts up to a digit numbers the run it's in
+    runs = np.cumsum(firsts) - 1
+    places = ends[runs] - 1 - cells
+    contributions = (raw[cells].astype(np.int64) - ZERO) * POWERS_OF_TEN[places]
+    return starts, ends, np.add.reduceat(contributions, np.flatnonzero(firsts))
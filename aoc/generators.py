@@ -0,0 +1,131 @@
+import random
+import string
+
+
+DIGIT_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+SCHEMATIC_SYMBOLS = "*#+$/@=%&-"
+COLORS = ("red", "green", "blue")
+ALMANAC_SECTIONS = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+
+# sizes of the generated puzzles at scale 1, roughly those of the real inputs
+BASE_SIZES = {
+    1: 1000,  # calibration lines
+    2: 100,  # games
+    3: 140,  # schematic rows (140 columns wide)
+    4: 200,  # scratchcards
+    5: 30,  # ranges per almanac map
+}
+
+
+def calibration_lines(num_lines: int, rng: random.Random) -> list[str]:
+    """Day 1 lines of letters, digits and spelled-out digits.
+
+    Every line has at least one numeric digit, so both parts can solve it.
+    """
+    lines = []
+    for _ in range(num_lines):
+        tokens = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(1, 8)):
+            kind = rng.random()
+            if kind < 0.25:
+                tokens.append(str(rng.randint(1, 9)))
+            elif kind < 0.5:
+                tokens.append(rng.choice(DIGIT_WORDS))
+            else:
+                tokens.append("".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 6))))
+        rng.shuffle(tokens)
+        lines.append("".join(tokens))
+    return lines
+
+
+def game_records(num_games: int, rng: random.Random, max_cubes=20) -> list[str]:
+    """Day 2 game records with one to six reveals of one to three colors."""
+    lines = []
+    for game_id in range(1, num_games + 1):
+        reveals = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(COLORS, rng.randint(1, len(COLORS)))
+            reveals.append(", ".join(f"{rng.randint(1, max_cubes)} {color}" for color in colors))
+        lines.append(f"Game {game_id}: " + "; ".join(reveals))
+    return lines
+
+
+def schematic(width: int, height: int, rng: random.Random) -> list[str]:
+    """Day 3 schematic rows of numbers, symbols and "." filler."""
+    rows = []
+    for _ in range(height):
+        row = []
+        while len(row) < width:
+            kind = rng.random()
+            if kind < 0.12:
+                number = str(rng.randint(1, 999))
+                row.extend(number[: width - len(row)])
+                if len(row) < width:
+                    row.append(".")
+            elif kind < 0.18:
+                row.append(rng.choice(SCHEMATIC_SYMBOLS))
+            else:
+                row.append(".")
+        rows.append("".join(row))
+    return rows
+
+
+def scratchcards(num_cards: int, rng: random.Random, winning=10, mine=25, max_number=99) -> list[str]:
+    """Day 4 scratchcards.
+
+    A card never wins more cards than there are after it, as the puzzle
+    promises.
+    """
+    lines = []
+    for idx in range(num_cards):
+        winning_nos = rng.sample(range(1, max_number + 1), winning)
+        matches = min(rng.randint(0, winning), rng.randint(0, winning), num_cards - idx - 1)
+        my_nos = rng.sample(winning_nos, matches)
+        others = [n for n in range(1, max_number + 1) if n not in winning_nos]
+        my_nos += rng.sample(others, mine - matches)
+        rng.shuffle(my_nos)
+        lines.append(
+            f"Card {idx + 1:>{len(str(num_cards))}}: "
+            + " ".join(f"{n:>2}" for n in winning_nos)
+            + " | "
+            + " ".join(f"{n:>2}" for n in my_nos)
+        )
+    return lines
+
+
+def almanac(ranges_per_map: int, rng: random.Random, seed_pairs=10, max_id=2**32, max_seed_range=500) -> list[str]:
+    """Day 5 almanac with ranges_per_map non-overlapping ranges in every map.
+
+    Seed ranges are kept short so brute-force reference answers stay cheap.
+    """
+    seeds = []
+    for _ in range(seed_pairs):
+        seeds += [rng.randrange(max_id), rng.randint(1, max_seed_range)]
+    lines = ["seeds: " + " ".join(map(str, seeds)), ""]
+    for this_type, next_type in zip(ALMANAC_SECTIONS, ALMANAC_SECTIONS[1:]):
+        lines.append(f"{this_type}-to-{next_type} map:")
+        bounds = sorted(rng.sample(range(max_id), 2 * ranges_per_map))
+        for src_start, src_end in zip(bounds[0::2], bounds[1::2]):
+            length = src_end - src_start
+            lines.append(f"{rng.randrange(max_id - length)} {src_start} {length}")
+        lines.append("")
+    return lines[:-1]
+
+
+def generate(day: int, scale: int = 1, seed: int = 0) -> str:
+    """Text of a day's puzzle input, BASE_SIZES[day] * scale big."""
+    rng = random.Random(f"{day}-{scale}-{seed}")
+    size = BASE_SIZES[day] * scale
+    if day == 1:
+        lines = calibration_lines(size, rng)
+    elif day == 2:
+        lines = game_records(size, rng)
+    elif day == 3:
+        lines = schematic(BASE_SIZES[3], size, rng)
+    elif day == 4:
+        lines = scratchcards(size, rng)
+    elif day == 5:
+        lines = almanac(size, rng)
+    else:
+        raise ValueError(f"Unknown day: {day}")
+    return "\n".join(lines) + "\n"
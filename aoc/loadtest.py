@@ -0,0 +1,57 @@
+import asyncio
+import statistics
+import time
+
+from aoc.client import SolveClient
+
+
+async def _client_load(address: dict, jobs: list[dict], pipeline: int, latencies: list, errors: list):
+    client = await SolveClient.connect(**address)
+    in_flight = asyncio.Semaphore(pipeline)
+
+    async def one(job):
+        async with in_flight:
+            start = time.perf_counter_ns()
+            response = await client.solve(**job)
+            latencies.append((time.perf_counter_ns() - start, response.get("total_ns", 0)))
+            if not response["ok"]:
+                errors.append(response["error"])
+
+    try:
+        await asyncio.gather(*(one(job) for job in jobs))
+    finally:
+        await client.close()
+
+
+async def run_load(address: dict, job: dict, clients=4, requests=100, pipeline=8) -> dict:
+    """Hammer a SolveServer with the same job from several pipelining clients.
+
+    Args:
+        address:  SolveClient.connect keyword arguments
+        job:  SolveClient.solve keyword arguments
+        clients:  concurrent connections
+        requests:  requests per client
+        pipeline:  requests each client keeps in flight
+
+    Returns:
+        a summary dict with throughput, client-side latency percentiles and the
+        mean solver time reported by the server, all times in milliseconds
+    """
+    latencies, errors = [], []
+    start = time.perf_counter_ns()
+    await asyncio.gather(
+        *(_client_load(address, [job] * requests, pipeline, latencies, errors) for _ in range(clients))
+    )
+    elapsed_ns = time.perf_counter_ns() - start
+    round_trips = sorted(latency for latency, _ in latencies)
+    quantiles = statistics.quantiles(round_trips, n=100) if len(round_trips) > 1 else round_trips * 99
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "elapsed_ms": elapsed_ns / 1e6,
+        "requests_per_s": len(latencies) / (elapsed_ns / 1e9),
+        "p50_ms": quantiles[49] / 1e6,
+        "p90_ms": quantiles[89] / 1e6,
+        "p99_ms": quantiles[98] / 1e6,
+        "mean_solve_ms": statistics.fmean(total for _, total in latencies) / 1e6,
+    }
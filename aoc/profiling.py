@@ -0,0 +1,182 @@
+import inspect
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import partial, wraps
+
+from aoc.tables import format_rows
+
+
+# set to a non-empty value other than "0" to count and time every day's hot functions
+ENV_VAR = "AOC_PROFILE"
+
+
+def enabled() -> bool:
+    return os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+class HotFunctionProfiler:
+    """Call counts and timings for the hot helpers each day module lists.
+
+    A day module names its hot helpers in a HOT_FUNCTIONS tuple ("func" or
+    "Class.method"). instrument() swaps each one for a wrapper that records its
+    calls, its inclusive time and the stack of instrumented frames it ran
+    under. Helpers call each other through module globals, so the wrappers
+    are picked up without editing the day. Nothing is wrapped unless
+    instrument() is called, so profiling costs nothing while it is off.
+
+    Attributes:
+        calls:  calls per function name
+        total_ns:  inclusive nanoseconds per function name
+        collapsed:  self nanoseconds per stack, a tuple of frame names from
+            the outermost frame in
+    """
+
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.total_ns = defaultdict(int)
+        self.collapsed = defaultdict(int)
+        self._stack = []
+        self._originals = []
+
+    def reset(self):
+        self.calls.clear()
+        self.total_ns.clear()
+        self.collapsed.clear()
+
+    def _enter(self, name: str):
+        # [name, start, nanoseconds spent in instrumented children]
+        self._stack.append([name, time.perf_counter_ns(), 0])
+
+    def _exit(self, count=True):
+        name, start, child_ns = self._stack[-1]
+        elapsed = time.perf_counter_ns() - start
+        self.collapsed[tuple(frame[0] for frame in self._stack)] += elapsed - child_ns
+        self._stack.pop()
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        if count:
+            self.calls[name] += 1
+        self.total_ns[name] += elapsed
+
+    @contextmanager
+    def frame(self, name: str):
+        """Record a block of code as a frame, e.g. one phase of a run."""
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def wrap(self, name: str, func):
+        if inspect.isgeneratorfunction(func):
+            return self._wrap_generator(name, func)
+
+        @wraps(func)
+        def counted(*args, **kwargs):
+            self._enter(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit()
+
+        return counted
+
+    def _wrap_generator(self, name: str, func):
+        # a generator's body runs a little at a time, so each resume is timed
+        # as a frame of whoever resumed it; the call is counted once
+        @wraps(func)
+        def counted(*args, **kwargs):
+            generator = func(*args, **kwargs)
+            first = True
+            while True:
+                self._enter(name)
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    return
+                finally:
+                    self._exit(count=first)
+                    first = False
+                yield item
+
+        return counted
+
+    def instrument(self, module, prefix: str):
+        """Wrap every function in module.HOT_FUNCTIONS, naming them prefix.func.
+
+        Module-level aliases of a wrapped function (parse_input = parse_games)
+        and module-level dicts holding it (SOLVERS, MODE_MAP) are pointed at
+        the wrapper too, since the runner calls through those.
+        """
+        for dotted in getattr(module, "HOT_FUNCTIONS", ()):
+            *owner_path, attr = dotted.split(".")
+            owner = module
+            for part in owner_path:
+                owner = getattr(owner, part)
+            original = owner.__dict__[attr] if isinstance(owner, type) else getattr(owner, attr)
+            if isinstance(original, (classmethod, staticmethod)):
+                wrapped = type(original)(self.wrap(f"{prefix}.{dotted}", original.__func__))
+            else:
+                wrapped = self.wrap(f"{prefix}.{dotted}", original)
+            self._replace(partial(setattr, owner, attr), original, wrapped)
+            if owner is not module:
+                continue
+            for name, value in list(vars(module).items()):
+                if value is original and name != attr:
+                    self._replace(partial(setattr, module, name), original, wrapped)
+                elif isinstance(value, dict):
+                    for key, item in list(value.items()):
+                        if item is original:
+                            self._replace(partial(value.__setitem__, key), original, wrapped)
+
+    def _replace(self, setter, original, wrapped):
+        self._originals.append((setter, original))
+        setter(wrapped)
+
+    def restore(self):
+        """Put back every function instrument() wrapped."""
+        while self._originals:
+            setter, original = self._originals.pop()
+            setter(original)
+
+    def stats(self) -> list[dict]:
+        """One dict per function that ran, slowest (inclusive) first."""
+        self_ns = defaultdict(int)
+        for stack, nanoseconds in self.collapsed.items():
+            self_ns[stack[-1]] += nanoseconds
+        return sorted(
+            (
+                {"name": name, "calls": calls, "total_ns": self.total_ns[name], "self_ns": self_ns[name]}
+                for name, calls in self.calls.items()
+            ),
+            key=lambda row: row["total_ns"],
+            reverse=True,
+        )
+
+    def write_collapsed(self, path):
+        """Write collapsed stacks ("a;b;c microseconds" lines) for flamegraph.pl
+        or speedscope."""
+        with open(path, "w") as f:
+            for stack, nanoseconds in sorted(self.collapsed.items()):
+                f.write(f"{';'.join(stack)} {nanoseconds // 1000}\n")
+
+
+# the profiler load_day instruments day modules with when profiling is enabled
+PROFILER = HotFunctionProfiler()
+
+
+def format_profile_table(stats: list[dict]) -> str:
+    headers = ["function", "calls", "total", "self", "per call"]
+    rows = [
+        [
+            row["name"],
+            str(row["calls"]),
+            f"{row['total_ns'] / 1e6:.3f}ms",
+            f"{row['self_ns'] / 1e6:.3f}ms",
+            f"{row['total_ns'] / row['calls'] / 1e3:.2f}us",
+        ]
+        for row in stats
+    ]
+    return format_rows(headers, rows)
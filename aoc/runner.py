@@ -0,0 +1,170 @@
+import importlib.util
+import re
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+from pathlib import Path
+
+from aoc import profiling
+from aoc.tables import format_rows
+
+
+ROOT = Path(__file__).resolve().parent.parent
+DAY_DIR_RE = re.compile(r"^day(\d+)$")
+PHASES = ("read", "parse", "solve")
+
+
+def discover_days(root=ROOT) -> dict[int, Path]:
+    """Map each day number to its solve.py, for every dayN directory in root."""
+    days = {}
+    for path in Path(root).iterdir():
+        match = DAY_DIR_RE.match(path.name)
+        if match and (path / "solve.py").is_file():
+            days[int(match.group(1))] = path / "solve.py"
+    return dict(sorted(days.items()))
+
+
+def load_day(day: int, root=ROOT):
+    """Import a day's solve.py as the module "dayN_solve".
+
+    Every day module provides read_input(path), parse_input(data) and a
+    SOLVERS dict of part number to a solver that takes the parsed input.
+    With profiling enabled, its HOT_FUNCTIONS are instrumented as it loads.
+    """
+    name = f"day{day}_solve"
+    if name in sys.modules:
+        return sys.modules[name]
+    path = discover_days(root).get(day)
+    if path is None:
+        raise ValueError(f"Unknown day: {day}")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # registered before exec so process pools can pickle the module's functions
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    if profiling.enabled():
+        profiling.PROFILER.instrument(module, f"day{day}")
+    return module
+
+
+def default_input(day: int, root=ROOT) -> Path:
+    return Path(root) / f"day{day}" / "input.txt"
+
+
+def _no_frame(name):
+    return nullcontext()
+
+
+def run_part(day: int, part: int, input_file=None, trace_memory=True, cache=None, profiler=None) -> dict:
+    """Solve one part of one day, timing the read, parse and solve phases.
+
+    With a ParsedCache, the read phase hashes the input and looks it up in the
+    cache. On a hit it also loads the cached parse and the parse phase is
+    skipped; on a miss the parse phase includes storing the result.
+
+    A cProfile.Profile passed as profiler is enabled for the three phases.
+    With profiling enabled, the run and each phase are frames of the hot
+    function profiler's stacks.
+
+    Returns:
+        a report dict with the answer, the wall time of each phase in
+        nanoseconds ("<phase>_ns") and, if trace_memory is set, the peak memory
+        allocated by each phase in bytes ("<phase>_peak_bytes"); with a cache,
+        "cache" is "hit" or "miss"
+    """
+    module = load_day(day)
+    solver = module.SOLVERS.get(part)
+    if solver is None:
+        raise ValueError(f"Unknown part: {part}")
+    input_file = Path(input_file) if input_file is not None else default_input(day)
+    report = {"day": day, "part": part, "input": str(input_file)}
+    steps = {
+        "read": lambda _: module.read_input(str(input_file)),
+        "parse": module.parse_input,
+        "solve": solver,
+    }
+    if cache is not None:
+        state = {}
+
+        def read(_):
+            state["key"] = cache.key(day, module, input_file)
+            parsed = cache.get(state["key"], module)
+            state["hit"] = parsed is not None
+            report["cache"] = "hit" if state["hit"] else "miss"
+            return parsed if state["hit"] else module.read_input(str(input_file))
+
+        def parse(value):
+            if state["hit"]:
+                return value
+            parsed = module.parse_input(value)
+            cache.put(state["key"], module, parsed)
+            return parsed
+
+        steps.update(read=read, parse=parse)
+
+    frame = profiling.PROFILER.frame if profiling.enabled() else _no_frame
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        value = None
+        with frame(f"day{day}.part{part}"):
+            for phase in PHASES:
+                if trace_memory:
+                    tracemalloc.reset_peak()
+                    baseline = tracemalloc.get_traced_memory()[0]
+                if profiler is not None:
+                    profiler.enable()
+                start = time.perf_counter_ns()
+                with frame(phase):
+                    value = steps[phase](value)
+                report[f"{phase}_ns"] = time.perf_counter_ns() - start
+                if profiler is not None:
+                    profiler.disable()
+                if trace_memory:
+                    report[f"{phase}_peak_bytes"] = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    report["answer"] = value
+    report["total_ns"] = sum(report[f"{phase}_ns"] for phase in PHASES)
+    return report
+
+
+def _format_ns(ns: int) -> str:
+    return f"{ns / 1e6:.3f}ms"
+
+
+def _format_bytes(num_bytes: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f}{unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f}GiB"
+
+
+def format_table(reports: list[dict]) -> str:
+    headers = ["day", "part", "answer"]
+    if any("cache" in report for report in reports):
+        headers.append("cache")
+    for phase in PHASES:
+        headers.append(phase)
+        if any(f"{phase}_peak_bytes" in report for report in reports):
+            headers.append(f"{phase} peak")
+    headers.append("total")
+
+    rows = []
+    for report in reports:
+        row = [str(report["day"]), str(report["part"]), str(report["answer"])]
+        if "cache" in headers:
+            row.append(report.get("cache", "-"))
+        for phase in PHASES:
+            row.append(_format_ns(report[f"{phase}_ns"]))
+            if f"{phase} peak" in headers:
+                row.append(_format_bytes(report.get(f"{phase}_peak_bytes", 0)))
+        row.append(_format_ns(report["total_ns"]))
+        rows.append(row)
+
+    return format_rows(headers, rows)
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from aoc.runner import discover_days, load_day, run_part
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), "aoc-solve.sock")
+# requests carrying a whole input inline are one (long) JSON line
+MAX_REQUEST_BYTES = 256 * 1024**2
+
+
+def _warm_worker():
+    """Process pool initializer: import every day up front, not per request."""
+    for day in discover_days():
+        load_day(day)
+    import numpy  # noqa: F401
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+def solve_request(request: dict) -> dict:
+    """Solve one request in a worker process.
+
+    A request names a day and part, plus either "input_path" (a file the
+    server can read) or "input" (the puzzle input itself, as text).
+    """
+    try:
+        day, part = int(request["day"]), int(request["part"])
+        if "input" in request:
+            with tempfile.NamedTemporaryFile("w", suffix=".txt") as f:
+                f.write(request["input"])
+                f.flush()
+                report = run_part(day, part, f.name, trace_memory=False)
+            report["input"] = None
+        else:
+            report = run_part(day, part, request["input_path"], trace_memory=False)
+        report["ok"] = True
+    except Exception as exc:
+        report = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+    return report
+
+
+class SolveServer:
+    """Local solve server with a pool of warm worker processes.
+
+    The protocol is JSON lines in both directions. Clients may pipeline:
+    every request line is handled as soon as it arrives, and responses are
+    written as they finish, carrying the request's "id" so they can be matched
+    up out of order. Each response includes the solver's phase timings and
+    "server_ns", the time from reading the request to writing the response.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count()
+        self.pool = None
+        self.server = None
+
+    async def start(self, socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_warm_worker)
+        # start every worker now so no request pays for interpreter start-up
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _worker_pid) for _ in range(self.workers)))
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.server = await asyncio.start_unix_server(self._handle, socket_path, limit=MAX_REQUEST_BYTES)
+        else:
+            self.server = await asyncio.start_server(self._handle, host, port, limit=MAX_REQUEST_BYTES)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    async def _handle(self, reader, writer):
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def _respond(self, line: bytes, writer):
+        received = time.perf_counter_ns()
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError(f"expected a JSON object, got {type(request).__name__}")
+        except ValueError as exc:
+            request = {}
+            response = {"ok": False, "error": f"bad request: {exc}"}
+        else:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(self.pool, solve_request, request)
+        response["id"] = request.get("id")
+        response["server_ns"] = time.perf_counter_ns() - received
+        writer.write(json.dumps(response, default=int).encode() + b"\n")
+        await writer.drain()
+
+
+async def serve(socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None):
+    server = SolveServer(workers)
+    await server.start(socket_path, host, port)
+    where = socket_path or f"{host}:{port}"
+    print(f"serving on {where} with {server.workers} warm workers", flush=True)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
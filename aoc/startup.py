@@ -0,0 +1,94 @@
+import subprocess
+import sys
+
+from aoc.runner import ROOT, discover_days
+from aoc.tables import format_rows
+
+
+# cumulative `python -X importtime` budget per entry point, in microseconds:
+# the measured import time plus roughly a third for noise, so a real
+# regression fails. Days 1 and 5 measure 20-30ms; days 2-4 need numpy and
+# measure 100-160ms; aoc.cli measures 60-90ms
+IMPORT_BUDGETS_US = {
+    "day1": 45_000,
+    "day2": 200_000,
+    "day3": 200_000,
+    "day4": 200_000,
+    "day5": 45_000,
+    "aoc.cli": 120_000,
+}
+DEFAULT_BUDGET_US = 200_000
+
+# test machinery has no business being imported by a solver
+FORBIDDEN_MODULES = {"pytest", "_pytest"}
+
+
+def entry_points(root=ROOT) -> dict[str, tuple]:
+    """Map entry point names to (working directory, module to import)."""
+    points = {f"day{day}": (path.parent, "solve") for day, path in discover_days(root).items()}
+    points["aoc.cli"] = (root, "aoc.cli")
+    return points
+
+
+def measure_import(cwd, module: str, repeat=3) -> (int, set[str]):
+    """Import a module in fresh interpreters with -X importtime.
+
+    Returns:
+        tuple of:
+            the fastest cumulative import time of the module, in microseconds
+            the names of every module imported along the way
+    """
+    best = None
+    imported = set()
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            _, cumulative, name = line[len("import time:") :].split("|")
+            imported.add(name.strip())
+            # the module itself is the only one that isn't indented
+            if name.strip() == module and not name[1:].startswith(" "):
+                cumulative_us = int(cumulative)
+                best = cumulative_us if best is None else min(best, cumulative_us)
+    return best, imported
+
+
+def check_startup(budgets=None, repeat=3) -> list[dict]:
+    budgets = IMPORT_BUDGETS_US if budgets is None else budgets
+    reports = []
+    for name, (cwd, module) in entry_points().items():
+        import_us, imported = measure_import(cwd, module, repeat)
+        budget_us = budgets.get(name, DEFAULT_BUDGET_US)
+        forbidden = sorted(imported & FORBIDDEN_MODULES)
+        reports.append(
+            {
+                "entry_point": name,
+                "import_us": import_us,
+                "budget_us": budget_us,
+                "forbidden": forbidden,
+                "ok": import_us <= budget_us and not forbidden,
+            }
+        )
+    return reports
+
+
+def format_startup_table(reports: list[dict]) -> str:
+    headers = ["entry point", "import", "budget", "forbidden imports", "ok"]
+    rows = [
+        [
+            report["entry_point"],
+            f"{report['import_us'] / 1000:.1f}ms",
+            f"{report['budget_us'] / 1000:.1f}ms",
+            ", ".join(report["forbidden"]) or "-",
+            str(report["ok"]),
+        ]
+        for report in reports
+    ]
+    return format_rows(headers, rows)
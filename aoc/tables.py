@@ -0,0 +1,6 @@
+def format_rows(headers: list[str], rows: list[list[str]]) -> str:
+    """Render a plain-text table: right-aligned columns under a dashed rule."""
+    widths = [max(len(cell) for cell in column) for column in zip(headers, *rows)]
+    lines = ["  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in [headers] + rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
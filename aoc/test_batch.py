@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from aoc import batch
+from aoc.batch import day_from_path, jobs_from_glob, parse_manifest, run_batch, run_job
+from aoc.runner import ROOT
+
+
+def test_parse_manifest():
+    lines = [
+        '{"day": 3, "part": 2, "input": "day3/input.txt"}\n',
+        "\n",
+        "# comment\n",
+        '{"day": "4", "part": 1, "input": "x.txt"}\n',
+    ]
+    assert parse_manifest(lines) == [
+        {"day": 3, "part": 2, "input": "day3/input.txt"},
+        {"day": 4, "part": 1, "input": "x.txt"},
+    ]
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("day3/input.txt", 3),
+        ("/data/day12/inputs/a.txt", 12),
+        ("generated/day5-x10.txt", 5),
+    ],
+)
+def test_day_from_path(path, expected):
+    assert day_from_path(path) == expected
+
+
+def test_jobs_from_glob():
+    jobs = jobs_from_glob(str(ROOT / "day[24]" / "test_input.txt"))
+    assert [(job["day"], job["part"]) for job in jobs] == [(2, 1), (2, 2), (4, 1), (4, 2)]
+    assert [job["day"] for job in jobs_from_glob(str(ROOT / "day4" / "*input.txt"), parts=[2])] == [4, 4]
+
+
+def test_jobs_from_glob_unloadable_day(tmp_path):
+    (tmp_path / "day99").mkdir()
+    (tmp_path / "day99" / "input.txt").write_text("")
+    jobs = jobs_from_glob(str(tmp_path / "day99" / "input.txt"))
+    assert [(job["day"], job["part"]) for job in jobs] == [(99, None)]
+    assert run_job(jobs[0])["error"] == "ValueError: Unknown day: 99"
+
+
+def test_run_job_reports_failures():
+    report = run_job({"day": 4, "part": 3, "input": str(ROOT / "day4" / "test_input.txt")})
+    assert report["ok"] is False
+    assert report["error"] == "ValueError: Unknown part: 3"
+    report = run_job({"day": 4, "part": 1, "input": "missing.txt"})
+    assert report["error"].startswith("FileNotFoundError")
+
+
+@pytest.mark.parametrize("chunksize", [1, 3])
+def test_run_batch(chunksize):
+    jobs = jobs_from_glob(str(ROOT / "day[2345]" / "test_input.txt"))
+    jobs.append({"day": 5, "part": 3, "input": str(ROOT / "day5" / "test_input.txt")})
+    reports = sorted(run_batch(jobs, workers=2, chunksize=chunksize), key=lambda report: report["job"])
+    assert [report["job"] for report in reports] == list(range(len(jobs)))
+    assert [report.get("answer") for report in reports] == [8, 2286, 4361 + 592 + 912, 467835, 13, 30, 35, 46, None]
+    assert [report["ok"] for report in reports] == [True] * 8 + [False]
+    assert all(report["wall_ns"] > 0 for report in reports)
+
+
+def test_run_batch_survives_worker_death(monkeypatch):
+    run_job = batch.run_job
+
+    def crashing_run_job(job, cache=None):
+        if job["input"] == "crash":
+            os._exit(1)
+        return run_job(job, cache)
+
+    # workers are forked, so they see the patched function
+    monkeypatch.setattr(batch, "run_job", crashing_run_job)
+    jobs = jobs_from_glob(str(ROOT / "day4" / "test_input.txt"))
+    jobs.insert(1, {"day": 4, "part": 1, "input": "crash"})
+    reports = sorted(run_batch(jobs, workers=2), key=lambda report: report["job"])
+    assert [report["job"] for report in reports] == [0, 1, 2]
+    assert [report.get("answer") for report in reports] == [13, None, 30]
+    assert reports[1]["error"].startswith("BrokenProcessPool")
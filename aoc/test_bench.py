@@ -0,0 +1,29 @@
+import pytest
+
+from aoc.bench import bench_part, bench_speedup, reference_answer
+from aoc.generators import BASE_SIZES, generate
+from aoc.runner import run_part
+
+
+@pytest.mark.parametrize("day", sorted(BASE_SIZES))
+@pytest.mark.parametrize("part", [1, 2])
+def test_reference_matches_solvers(day, part, tmp_path):
+    input_file = tmp_path / "input.txt"
+    input_file.write_text(generate(day, 1, seed=3))
+    assert run_part(day, part, input_file, trace_memory=False)["answer"] == reference_answer(day, part, input_file)
+
+
+def test_bench_part():
+    reports = bench_part(4, 2, scales=(1, 2), check_max_scale=1)
+    assert [report["scale"] for report in reports] == [1, 2]
+    assert reports[0]["correct"] is True
+    assert "correct" not in reports[1]
+    assert "scaling" in reports[1]
+
+
+def test_bench_speedup(tmp_path):
+    reports = bench_speedup(2, 200_000, workers=(1, 2), chunk_size=50_000, workdir=tmp_path)
+    assert [report["workers"] for report in reports] == [1, 2]
+    assert all(report["correct"] for report in reports)
+    assert reports[0]["speedup"] == reports[0]["efficiency"] == 1.0
+    assert reports[1]["input_bytes"] >= 200_000
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from aoc.cache import ParsedCache, file_digest
+from aoc.runner import ROOT, default_input, load_day, run_part
+
+
+@pytest.mark.parametrize("day", [1, 2, 3, 4, 5])
+def test_round_trip(day, tmp_path):
+    module = load_day(day)
+    cache = ParsedCache(tmp_path)
+    parsed, hit = cache.load_or_parse(day, module, default_input(day))
+    assert hit is False
+    cached, hit = cache.load_or_parse(day, module, default_input(day))
+    assert hit is True
+    for part, solver in module.SOLVERS.items():
+        assert solver(cached) == solver(parsed)
+
+
+def test_run_part_uses_cache(tmp_path):
+    cache = ParsedCache(tmp_path / "cache")
+    input_file = ROOT / "day4" / "test_input.txt"
+    first = run_part(4, 1, input_file, trace_memory=False, cache=cache)
+    second = run_part(4, 2, input_file, trace_memory=False, cache=cache)
+    assert (first["cache"], first["answer"]) == ("miss", 13)
+    assert (second["cache"], second["answer"]) == ("hit", 30)
+
+
+def test_key_changes_with_content_and_version(tmp_path):
+    module = load_day(4)
+    cache = ParsedCache(tmp_path)
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("Card 1: 1 | 1\n")
+    key = cache.key(4, module, input_file)
+    assert key == f"day4-v{module.PARSER_VERSION}-{file_digest(input_file)}"
+    input_file.write_text("Card 1: 1 | 2\n")
+    assert cache.key(4, module, input_file) != key
+    assert cache.key(5, module, input_file).startswith("day5-")
+
+
+def test_evicts_least_recently_used(tmp_path):
+    module = load_day(4)
+    cache = ParsedCache(tmp_path / "cache")
+    inputs = []
+    for idx in range(3):
+        input_file = tmp_path / f"input{idx}.txt"
+        input_file.write_text(f"Card 1: {idx} | {idx}\n")
+        inputs.append(input_file)
+        cache.load_or_parse(4, module, input_file)
+        # mtimes drive the LRU order; space them out explicitly
+        entry = tmp_path / "cache" / cache.key(4, module, input_file)
+        os.utime(entry, (idx, idx))
+    entry_size = cache.entries()[0][1]
+
+    # touching the oldest entry makes it the most recently used
+    cache.get(cache.key(4, module, inputs[0]), module)
+    cache.max_bytes = 2 * entry_size
+    cache.evict()
+    remaining = {path.name for path, _ in cache.entries()}
+    assert remaining == {cache.key(4, module, inputs[0]), cache.key(4, module, inputs[2])}
@@ -0,0 +1,12 @@
+import numpy as np
+
+from aoc.digits import digit_runs
+
+
+def test_digit_runs():
+    raw = np.frombuffer(b"7.467..114\n35 | 0633.", dtype=np.uint8)
+    starts, ends, values = digit_runs(raw)
+    assert starts.tolist() == [0, 2, 7, 11, 16]
+    assert ends.tolist() == [1, 5, 10, 13, 20]
+    assert values.tolist() == [7, 467, 114, 35, 633]
+    assert [len(column) for column in digit_runs(np.frombuffer(b"..", dtype=np.uint8))] == [0, 0, 0]
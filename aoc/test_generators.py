@@ -0,0 +1,18 @@
+import pytest
+
+from aoc.generators import BASE_SIZES, generate
+
+
+@pytest.mark.parametrize("day", sorted(BASE_SIZES))
+def test_generate_is_deterministic(day):
+    assert generate(day, 2, seed=7) == generate(day, 2, seed=7)
+    assert generate(day, 2, seed=7) != generate(day, 2, seed=8)
+
+
+def test_generate_sizes():
+    assert len(generate(1, 3).splitlines()) == 3000
+    assert len(generate(2, 1).splitlines()) == 100
+    assert {len(row) for row in generate(3, 2).splitlines()} == {140}
+    assert len(generate(3, 2).splitlines()) == 280
+    assert len(generate(4, 1).splitlines()) == 200
+    assert sum(line[:1].isdigit() for line in generate(5, 2).splitlines()) == 7 * 60
@@ -0,0 +1,76 @@
+import cProfile
+import pstats
+
+import pytest
+
+from aoc import profiling
+from aoc.profiling import HotFunctionProfiler, format_profile_table
+from aoc.runner import default_input, discover_days, load_day, run_part
+
+
+@pytest.mark.parametrize("day", list(discover_days()))
+def test_hot_functions_exist(day):
+    module = load_day(day)
+    profiler = HotFunctionProfiler()
+    profiler.instrument(module, f"day{day}")
+    try:
+        assert len(profiler._originals) >= len(module.HOT_FUNCTIONS) > 0
+    finally:
+        profiler.restore()
+
+
+def test_instrument_counts_and_restores(tmp_path):
+    module = load_day(5)
+    original = module.stream_almanac
+    profiler = HotFunctionProfiler()
+    profiler.instrument(module, "day5")
+    try:
+        # the alias the runner calls is wrapped along with the function
+        assert module.stream_almanac is module.parse_input is not original
+        almanac = module.parse_input(module.read_input(str(default_input(5))))
+        with profiler.frame("solve"):
+            module.SOLVERS[1](almanac)
+    finally:
+        profiler.restore()
+    assert module.stream_almanac is module.parse_input is original
+
+    stats = {row["name"]: row for row in profiler.stats()}
+    # one from_flat per map, called as a classmethod
+    assert stats["day5.SectionMap.from_flat"]["calls"] == 7
+    assert stats["day5.lowest_location"]["calls"] == 1
+    assert stats["solve"]["total_ns"] >= stats["day5.lowest_location"]["total_ns"]
+    assert stats["day5.stream_almanac"]["calls"] == 1
+    assert ("solve", "day5.lowest_location", "day5.map_ranges") in profiler.collapsed
+    assert "day5.map_ranges" in format_profile_table(profiler.stats())
+
+    profiler.write_collapsed(tmp_path / "collapsed.txt")
+    lines = (tmp_path / "collapsed.txt").read_text().splitlines()
+    assert any(line.startswith("solve;day5.lowest_location;day5.map_ranges ") for line in lines)
+
+
+def test_run_part_profile(monkeypatch):
+    monkeypatch.setenv(profiling.ENV_VAR, "1")
+    profiling.PROFILER.reset()
+    profiling.PROFILER.instrument(load_day(2), "day2")
+    profile = cProfile.Profile()
+    try:
+        run_part(2, 1, trace_memory=False, profiler=profile)
+        stats = {row["name"]: row for row in profiling.PROFILER.stats()}
+        collapsed = dict(profiling.PROFILER.collapsed)
+    finally:
+        profiling.PROFILER.restore()
+        profiling.PROFILER.reset()
+    # parse_input and SOLVERS reach the wrappers; the generator counts once per game
+    assert stats["day2.parse_games"]["calls"] == stats["day2.feasible_id_sum"]["calls"] == 1
+    assert stats["day2._reveal_counts"]["calls"] == stats["day2._parse_game_id"]["calls"] == 100
+    assert stats["day2._game_maxima"]["calls"] == 100
+    assert ("day2.part1", "parse", "day2.parse_games", "day2._game_maxima", "day2._reveal_counts") in collapsed
+    functions = {name for _, _, name in pstats.Stats(profile).stats}
+    assert "parse_games" in functions
+
+
+def test_disabled_by_default(monkeypatch):
+    monkeypatch.delenv(profiling.ENV_VAR, raising=False)
+    assert not profiling.enabled()
+    monkeypatch.setenv(profiling.ENV_VAR, "0")
+    assert not profiling.enabled()
@@ -0,0 +1,43 @@
+import pytest
+
+from aoc.runner import (
+    PHASES,
+    ROOT,
+    default_input,
+    discover_days,
+    format_table,
+    run_part,
+)
+
+
+def test_discover_days():
+    days = discover_days()
+    assert list(days)[:5] == [1, 2, 3, 4, 5]
+    assert days[3] == ROOT / "day3" / "solve.py"
+
+
+@pytest.mark.parametrize(
+    "day, part, expected",
+    [
+        (1, 1, 55108),
+        (2, 2, 2286),
+        (3, 1, 4361 + 592 + 912),
+        (4, 2, 30),
+        (5, 2, 46),
+    ],
+)
+def test_run_part(day, part, expected):
+    input_file = default_input(day) if day == 1 else ROOT / f"day{day}" / "test_input.txt"
+    report = run_part(day, part, input_file)
+    assert report["answer"] == expected
+    assert report["total_ns"] == sum(report[f"{phase}_ns"] for phase in PHASES)
+    assert all(report[f"{phase}_peak_bytes"] >= 0 for phase in PHASES)
+    assert "read_peak_bytes" not in run_part(day, part, input_file, trace_memory=False)
+
+
+def test_format_table():
+    report = {"day": 4, "part": 1, "answer": 13, "total_ns": 6_000_000}
+    report.update({f"{phase}_ns": 2_000_000 for phase in PHASES})
+    lines = format_table([report]).split("\n")
+    assert lines[0].split() == ["day", "part", "answer", "read", "parse", "solve", "total"]
+    assert lines[2].split() == ["4", "1", "13", "2.000ms", "2.000ms", "2.000ms", "6.000ms"]
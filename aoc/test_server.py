@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+from aoc.client import SolveClient
+from aoc.loadtest import run_load
+from aoc.runner import ROOT
+from aoc.server import SolveServer, solve_request
+
+
+def test_solve_request():
+    assert solve_request({"day": 4, "part": 2, "input_path": str(ROOT / "day4" / "test_input.txt")})["answer"] == 30
+    text = (ROOT / "day2" / "test_input.txt").read_text()
+    assert solve_request({"day": 2, "part": 1, "input": text})["answer"] == 8
+    response = solve_request({"day": 2, "part": 7, "input": text})
+    assert response == {"ok": False, "error": "ValueError: Unknown part: 7"}
+
+
+def _with_server(tmp_path, scenario):
+    async def main():
+        server = SolveServer(workers=2)
+        socket_path = str(tmp_path / "solve.sock")
+        await server.start(socket_path)
+        try:
+            return await scenario({"socket_path": socket_path})
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_pipelined_requests(tmp_path):
+    async def scenario(address):
+        client = await SolveClient.connect(**address)
+        jobs = [(day, part) for day in (2, 4, 5) for part in (1, 2)]
+        try:
+            # all requests are sent before any response is read
+            return await asyncio.gather(
+                *(client.solve(day, part, ROOT / f"day{day}" / "test_input.txt") for day, part in jobs)
+            )
+        finally:
+            await client.close()
+
+    responses = _with_server(tmp_path, scenario)
+    assert [response["answer"] for response in responses] == [8, 2286, 13, 30, 35, 46]
+    assert all(response["server_ns"] >= response["total_ns"] for response in responses)
+
+
+def test_run_load(tmp_path):
+    async def scenario(address):
+        job = {"day": 4, "part": 1, "input_path": ROOT / "day4" / "test_input.txt"}
+        return await run_load(address, job, clients=3, requests=10, pipeline=4)
+
+    summary = _with_server(tmp_path, scenario)
+    assert summary["requests"] == 30
+    assert summary["errors"] == 0
+    assert summary["p50_ms"] <= summary["p99_ms"]
+
+
+def test_bad_requests_get_responses(tmp_path):
+    async def scenario(address):
+        reader, writer = await asyncio.open_unix_connection(address["socket_path"])
+        writer.write(b"[1]\nnot json\n")
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(2)]
+        writer.close()
+        await writer.wait_closed()
+        return responses
+
+    responses = _with_server(tmp_path, scenario)
+    assert all(response["ok"] is False and response["id"] is None for response in responses)
+    assert "bad request: expected a JSON object, got list" in {response["error"] for response in responses}
@@ -0,0 +1,22 @@
+from aoc.runner import ROOT
+from aoc.startup import check_startup, entry_points, measure_import
+
+
+def test_entry_points():
+    points = entry_points()
+    assert points["day3"] == (ROOT / "day3", "solve")
+    assert points["aoc.cli"] == (ROOT, "aoc.cli")
+
+
+def test_measure_import():
+    import_us, imported = measure_import(ROOT / "day1", "solve", repeat=1)
+    assert import_us > 0
+    assert {"solve", "argparse", "mmap"} <= imported
+    assert "numpy" not in imported
+
+
+def test_solvers_start_within_budget():
+    reports = check_startup()
+    for report in reports:
+        assert not report["forbidden"], report
+        assert report["import_us"] <= report["budget_us"], report
@@ -1,7 +1,14 @@
 import argparse
-import pytest
+import io
+import mmap
+import os
+import sys
+from collections import deque
 from typing import Union
 
+# numpy is only imported by the --mmap and --workers helpers, so the default path
+# starts fast
+
 
 def get_digits_from_string(the_string) -> int:
     """Get the first and last digit from a string, combine them to form an int.
@@ -15,81 +22,336 @@ DIGITS = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine'
 
 
 def string_matches_digit(the_string, position) -> Union[int, None]:
-    for digit_str in DIGITS:
+    for value, digit_str in enumerate(DIGITS, start=1):
         if the_string[position:position+len(digit_str)] == digit_str:
-            return str(DIGITS.index(digit_str) + 1)
+            return str(value)
+
+
+class DigitAutomaton:
+    """Aho-Corasick automaton that finds digit tokens in a single pass.
+
+    Failure links are folded into the transition table up front, so scanning
+    is one dict lookup per character with no backtracking. Overlapping tokens
+    like "eightwo" are still found because every state already knows the
+    longest token suffix it can fall back to.
+    """
+
+    def __init__(self, tokens: dict[str, str]):
+        # trie of the tokens; state 0 is the root
+        goto = [{}]
+        self.outputs = [None]
+        for token, value in tokens.items():
+            state = 0
+            for char in token:
+                if char not in goto[state]:
+                    goto.append({})
+                    self.outputs.append(None)
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            self.outputs[state] = value
+
+        # breadth-first, so a state's failure target is always finished first
+        fail = [0] * len(goto)
+        self.transitions = [dict() for _ in goto]
+        self.transitions[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            self.transitions[state] = {**self.transitions[fail[state]], **goto[state]}
+            if self.outputs[state] is None:
+                self.outputs[state] = self.outputs[fail[state]]
+            for char, next_state in goto[state].items():
+                fail[next_state] = self.transitions[fail[state]].get(char, 0)
+                queue.append(next_state)
+
+    def first_match(self, chars) -> Union[str, None]:
+        """Return the value of the first token to finish in chars, or None."""
+        transitions = self.transitions
+        outputs = self.outputs
+        state = 0
+        for char in chars:
+            state = transitions[state].get(char, 0)
+            if outputs[state] is not None:
+                return outputs[state]
+        return None
+
+
+# no digit token is contained in another, so the first token to *finish* is
+# also the first to start; scanning the reversed line finds the last token
+DIGIT_TOKENS = {digit_str: str(value) for value, digit_str in enumerate(DIGITS, start=1)}
+DIGIT_TOKENS.update({str(value): str(value) for value in range(1, 10)})
+FORWARD_DIGITS = DigitAutomaton(DIGIT_TOKENS)
+BACKWARD_DIGITS = DigitAutomaton({token[::-1]: value for token, value in DIGIT_TOKENS.items()})
+# same automata, but stepping over the ints you get from iterating bytes
+FORWARD_DIGIT_BYTES = DigitAutomaton({token.encode(): value for token, value in DIGIT_TOKENS.items()})
+BACKWARD_DIGIT_BYTES = DigitAutomaton({token[::-1].encode(): value for token, value in DIGIT_TOKENS.items()})
 
 
 def get_digits_from_string_pt_2(the_string) -> int:
-    first, last = (None, None)
-    for i in range(len(the_string)):
-        value = None
-        if the_string[i].isdigit():
-            value = the_string[i]
-        else:
-            str_digit_match = string_matches_digit(the_string, i)
-            if str_digit_match is not None:
-                value = str_digit_match
-        if value is not None:
-            if first is None:
-                first = value
-            else:
-                last = value
-    if last is None:
-        last = first
+    first = FORWARD_DIGITS.first_match(the_string)
+    last = BACKWARD_DIGITS.first_match(reversed(the_string))
     # these should still be strings; concatenating, not adding
     return int(first + last)
 
 
-@pytest.mark.parametrize(
-    "the_string, expected", [
-        ('1abc2', 12),
-        ('pqr3stu8vwx', 38),
-        ('a1b2c3d4e5f', 15),
-        ('treb7uchet', 77)
-    ]
-)
-def test_get_digits_from_string(the_string, expected):
-    assert get_digits_from_string(the_string) == expected
-
-
-@pytest.mark.parametrize(
-    "the_string, expected", [
-        ('two1nine', 29),
-        ('eightwothree', 83),
-        ('abcone2threexyz', 13),
-        ('xtwone3four', 24),
-        ('4nineeightseven2', 42),
-        ('zoneight234', 14),
-        ('7pqrstsixteen', 76),
-    ]
-)
-def test_get_digits_from_string(the_string, expected):
-    assert get_digits_from_string_pt_2(the_string) == expected
-
-
 def get_lines_from_file(filename):
+    if filename == '-':
+        return sys.stdin.readlines()
     with open(filename, 'r') as f:
         data = f.readlines()
     return data
 
 
+read_input = get_lines_from_file
+
+
+def parse_input(data):
+    # lines are solved as they are; there's nothing to pre-parse
+    return data
+
+
+# bump whenever parse_input's output changes, so cached parses are rebuilt
+PARSER_VERSION = 1
+
+
+def dump_parsed(data) -> dict:
+    """Arrays to cache for the output of parse_input."""
+    import numpy as np
+
+    return {'text': np.frombuffer(''.join(data).encode(), dtype=np.uint8)}
+
+
+def load_parsed(arrays) -> list[str]:
+    return bytes(arrays['text']).decode().splitlines(keepends=True)
+
+
+def solution_one(data):
+    return sum(get_digits_from_string(line) for line in data)
+
+
+def solution_two(data):
+    return sum(get_digits_from_string_pt_2(line) for line in data)
+
+
+MODE_MAP = {
+    1: solution_one,
+    2: solution_two,
+}
+
+# the helpers the solvers spend their time in, which python -m aoc counts and
+# times when profiling is on (see aoc.profiling)
+HOT_FUNCTIONS = (
+    'get_digits_from_string',
+    'get_digits_from_string_pt_2',
+    'DigitAutomaton.first_match',
+    'calibration_block_pt_1',
+    'calibration_block_pt_2',
+)
+
+# solvers that take the output of parse_input
+SOLVERS = MODE_MAP
+
+
+# bytes of input handled at once by the bytes-level pipeline; bounds memory use
+CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def iter_line_blocks(f, chunk_size=CHUNK_SIZE):
+    """Yield buffers of whole lines from a binary file object.
+
+    Regular files are memory-mapped and yielded as zero-copy memoryview slices
+    that end on a newline. Pipes (and empty files) can't be mapped, so they are
+    read chunk_size bytes at a time instead, carrying any partial last line
+    over into the next block.
+    """
+    try:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, io.UnsupportedOperation):
+        mapped = None
+
+    if mapped is None:
+        carry = b''
+        while chunk := f.read(chunk_size):
+            block = carry + chunk
+            split = block.rfind(b'\n') + 1
+            carry = block[split:]
+            if split:
+                yield block[:split]
+        if carry:
+            yield carry
+        return
+
+    with mapped:
+        yield from _mapped_line_blocks(mapped, 0, len(mapped), chunk_size)
+
+
+def _mapped_line_blocks(mapped, start, stop, chunk_size):
+    """Zero-copy slices of mapped[start:stop] that end on a newline."""
+    while start < stop:
+        end = mapped.find(b'\n', min(start + chunk_size, stop) - 1, stop)
+        end = stop if end == -1 else end + 1
+        with memoryview(mapped)[start:end] as block:
+            yield block
+        start = end
+
+
+def _line_bounds(buf: 'np.ndarray') -> ('np.ndarray', 'np.ndarray'):
+    """Start and (exclusive) end offsets of every line in a uint8 buffer."""
+    import numpy as np
+
+    line_ends = np.flatnonzero(buf == ord('\n'))
+    if len(buf) and buf[-1] != ord('\n'):
+        line_ends = np.append(line_ends, len(buf))
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+    return line_starts, line_ends
+
+
+def calibration_block_pt_1(block) -> int:
+    """Part one total for a buffer of whole lines, without splitting it.
+
+    Digit positions come from one vectorized mask over the buffer; each line's
+    first and last digit are then found by binary-searching those positions
+    with the line's start and end offsets. Lines without a digit add nothing.
+    """
+    import numpy as np
+
+    buf = np.frombuffer(block, dtype=np.uint8)
+    digit_positions = np.flatnonzero((buf >= ord('0')) & (buf <= ord('9')))
+    if not len(digit_positions):
+        return 0
+    line_starts, line_ends = _line_bounds(buf)
+    first_idx = np.searchsorted(digit_positions, line_starts)
+    last_idx = np.searchsorted(digit_positions, line_ends) - 1
+    has_digit = first_idx <= last_idx
+    first = buf[digit_positions[first_idx[has_digit]]].astype(np.int64) - ord('0')
+    last = buf[digit_positions[last_idx[has_digit]]].astype(np.int64) - ord('0')
+    return int((first * 10 + last).sum())
+
+
+def calibration_block_pt_2(block) -> int:
+    """Part two total for a buffer of whole lines, without splitting it.
+
+    Lines are scanned in place with the bytes automata, from the front for the
+    first digit and from the back for the last one. Lines without a digit add
+    nothing.
+    """
+    import numpy as np
+
+    view = memoryview(block)
+    line_starts, line_ends = _line_bounds(np.frombuffer(view, dtype=np.uint8))
+    total = 0
+    for start, end in zip(line_starts.tolist(), line_ends.tolist()):
+        line = view[start:end]
+        first = FORWARD_DIGIT_BYTES.first_match(line)
+        if first is not None:
+            last = BACKWARD_DIGIT_BYTES.first_match(reversed(line))
+            total += int(first + last)
+    return total
+
+
+BLOCK_SOLVERS = {
+    1: calibration_block_pt_1,
+    2: calibration_block_pt_2,
+}
+
+
+def calibration_total(f, part, chunk_size=CHUNK_SIZE) -> int:
+    """Calibration total for a binary file object, in constant memory."""
+    solver = BLOCK_SOLVERS[part]
+    return sum(solver(block) for block in iter_line_blocks(f, chunk_size))
+
+
+# bytes of the file handed to a worker at a time by the parallel pipeline
+PARALLEL_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def newline_ranges(filename, chunk_size=PARALLEL_CHUNK_SIZE) -> list[tuple[int, int]]:
+    """Split a file into (start, end) byte ranges of about chunk_size bytes.
+
+    Every range but the last ends just past a newline, so no line is split
+    between two ranges.
+    """
+    ranges = []
+    with open(filename, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return ranges
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            start = 0
+            while start < size:
+                end = mapped.find(b'\n', min(start + chunk_size, size) - 1)
+                end = size if end == -1 else end + 1
+                ranges.append((start, end))
+                start = end
+    return ranges
+
+
+def calibration_range(filename, part, start, end, chunk_size=CHUNK_SIZE) -> int:
+    """Calibration total of the lines in bytes start to end of a file.
+
+    Only that slice is memory-mapped (from the allocation boundary at or below
+    start), so each worker of parallel_calibration_total maps its own piece.
+    """
+    solver = BLOCK_SOLVERS[part]
+    offset = start - start % mmap.ALLOCATIONGRANULARITY
+    with open(filename, 'rb') as f:
+        with mmap.mmap(f.fileno(), end - offset, access=mmap.ACCESS_READ, offset=offset) as mapped:
+            blocks = _mapped_line_blocks(mapped, start - offset, end - offset, chunk_size)
+            return sum(solver(block) for block in blocks)
+
+
+def parallel_calibration_total(filename, part, workers=None, chunk_size=PARALLEL_CHUNK_SIZE) -> int:
+    """Calibration total of a file, its newline-aligned ranges solved on a process pool."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    ranges = newline_ranges(filename, chunk_size)
+    if not ranges:
+        return 0
+    with ProcessPoolExecutor(workers or os.cpu_count()) as pool:
+        futures = [pool.submit(calibration_range, filename, part, start, end) for start, end in ranges]
+        return sum(future.result() for future in futures)
+
+
 def main(args):
     part = args.part
-    filename = 'input.txt'
+    filename = args.input_file
+    if args.workers:
+        if filename == '-':
+            raise SystemExit('--workers needs an input file, not stdin')
+        print(parallel_calibration_total(filename, part, args.workers, args.chunk_size))
+        return
+    if args.mmap:
+        if filename == '-':
+            print(calibration_total(sys.stdin.buffer, part))
+        else:
+            with open(filename, 'rb') as f:
+                print(calibration_total(f, part))
+        return
+
     data = get_lines_from_file(filename)
-    total = 0
-    for line in data:
-        if part == 1:
-            total += get_digits_from_string(line)
-        if part == 2:
-            total += get_digits_from_string_pt_2(line)
-    print(total)
+    print(MODE_MAP[part](data))
 
 
 def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument('part', type=int)
+    parser.add_argument('input_file', nargs='?', default='input.txt', help='input file, or - for stdin')
+    parser.add_argument(
+        '--mmap',
+        action='store_true',
+        help='compute the total straight from the bytes of the input, in constant memory',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='split the file into newline-aligned ranges and solve them on this many processes',
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=PARALLEL_CHUNK_SIZE,
+        help='with --workers, bytes of the file per range (default: %(default)s)',
+    )
     return parser.parse_args()
 
 
@@ -0,0 +1,107 @@
+import io
+import pytest
+
+from solve import (
+    BACKWARD_DIGITS,
+    CHUNK_SIZE,
+    FORWARD_DIGITS,
+    MODE_MAP,
+    calibration_block_pt_1,
+    calibration_block_pt_2,
+    calibration_total,
+    get_digits_from_string,
+    get_digits_from_string_pt_2,
+    calibration_range,
+    get_lines_from_file,
+    newline_ranges,
+    parallel_calibration_total,
+)
+
+
+@pytest.mark.parametrize(
+    "the_string, expected", [
+        ('eightwo', ('8', '2')),
+        ('twone', ('2', '1')),
+        ('oneight', ('1', '8')),
+        ('sevenine', ('7', '9')),
+        ('nnineight', ('9', '8')),
+        ('xx3xx', ('3', '3')),
+        ('xyz', (None, None)),
+    ]
+)
+def test_digit_automaton(the_string, expected):
+    first = FORWARD_DIGITS.first_match(the_string)
+    last = BACKWARD_DIGITS.first_match(reversed(the_string))
+    assert (first, last) == expected
+
+
+@pytest.mark.parametrize(
+    "the_string, expected", [
+        ('1abc2', 12),
+        ('pqr3stu8vwx', 38),
+        ('a1b2c3d4e5f', 15),
+        ('treb7uchet', 77)
+    ]
+)
+def test_get_digits_from_string(the_string, expected):
+    assert get_digits_from_string(the_string) == expected
+
+
+@pytest.mark.parametrize(
+    "the_string, expected", [
+        ('two1nine', 29),
+        ('eightwothree', 83),
+        ('abcone2threexyz', 13),
+        ('xtwone3four', 24),
+        ('4nineeightseven2', 42),
+        ('zoneight234', 14),
+        ('7pqrstsixteen', 76),
+    ]
+)
+def test_get_digits_from_string_pt_2(the_string, expected):
+    assert get_digits_from_string_pt_2(the_string) == expected
+
+
+@pytest.mark.parametrize("part", [1, 2])
+@pytest.mark.parametrize("chunk_size", [1, 7, CHUNK_SIZE])
+def test_calibration_total(part, chunk_size):
+    data = get_lines_from_file('input.txt')
+    expected = MODE_MAP[part](data)
+    with open('input.txt', 'rb') as f:
+        assert calibration_total(f, part, chunk_size) == expected
+    # not mappable, so this takes the chunked read() path
+    with io.BytesIO(b''.join(line.encode() for line in data)) as f:
+        assert calibration_total(f, part, chunk_size) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5000, CHUNK_SIZE])
+def test_newline_ranges(chunk_size):
+    with open('input.txt', 'rb') as f:
+        text = f.read()
+    ranges = newline_ranges('input.txt', chunk_size)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(text)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    assert all(text[end - 1 : end] == b'\n' for _, end in ranges[:-1])
+    # ranges past the first page are mapped from a page-aligned offset below them
+    for part in (1, 2):
+        expected = MODE_MAP[part](get_lines_from_file('input.txt'))
+        assert sum(calibration_range('input.txt', part, start, end, 1000) for start, end in ranges) == expected
+
+
+def test_parallel_calibration_total(tmp_path):
+    for part in (1, 2):
+        expected = MODE_MAP[part](get_lines_from_file('input.txt'))
+        assert parallel_calibration_total('input.txt', part, workers=2, chunk_size=5000) == expected
+    unterminated = tmp_path / 'unterminated.txt'
+    unterminated.write_bytes(b'1abc2\nxtwone3four')
+    assert newline_ranges(unterminated, 4) == [(0, 6), (6, 17)]
+    assert parallel_calibration_total(unterminated, 2, workers=2, chunk_size=4) == 12 + 24
+    empty = tmp_path / 'empty.txt'
+    empty.write_bytes(b'')
+    assert parallel_calibration_total(empty, 1, workers=2) == 0
+
+
+def test_calibration_block():
+    block = b'1abc2\nxtwone3four\n\nnodigits\neightwo'
+    assert calibration_block_pt_1(block) == 12 + 33
+    assert calibration_block_pt_2(block) == 12 + 24 + 82
@@ -1,7 +1,9 @@
 import argparse
-import pytest
-import functools
-import operator
+import os
+import sys
+import time
+import numpy as np
+from array import array
 
 
 PART_ONE_CUBE_LIMITS = {
@@ -10,6 +12,10 @@ PART_ONE_CUBE_LIMITS = {
     "blue": 14,
 }
 
+# column order for the per-color arrays in GameStore
+COLORS = ("red", "green", "blue")
+COLOR_INDEX = {color: idx for idx, color in enumerate(COLORS)}
+
 
 def _parse_game_id(input_line) -> int:
     GAME = "Game "
@@ -17,18 +23,6 @@ def _parse_game_id(input_line) -> int:
     return int(input_line[len(GAME) :])
 
 
-@pytest.mark.parametrize(
-    "input_line, expected",
-    [
-        ("Game 1", 1),
-        ("Game 2", 2),
-        ("Game 3", 3),
-    ],
-)
-def test_parse_game_id(input_line, expected):
-    assert _parse_game_id(input_line) == expected
-
-
 def _parse_reveals(input_line: str) -> list[dict]:
     reveals = []
     str_reveals = input_line.split("; ")
@@ -41,47 +35,6 @@ def _parse_reveals(input_line: str) -> list[dict]:
     return reveals
 
 
-@pytest.mark.parametrize(
-    "input_line, expected",
-    [
-        (
-            "3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green",
-            [{"blue": 3, "red": 4}, {"red": 1, "green": 2, "blue": 6}, {"green": 2}],
-        ),
-        (
-            "1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue",
-            [
-                {"blue": 1, "green": 2},
-                {"green": 3, "blue": 4, "red": 1},
-                {"green": 1, "blue": 1},
-            ],
-        ),
-        (
-            "8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red",
-            [
-                {"green": 8, "blue": 6, "red": 20},
-                {"blue": 5, "red": 4, "green": 13},
-                {"green": 5, "red": 1},
-            ],
-        ),
-        (
-            "1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red",
-            [
-                {"green": 1, "red": 3, "blue": 6},
-                {"green": 3, "red": 6},
-                {"green": 3, "blue": 15, "red": 14},
-            ],
-        ),
-        (
-            "6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green",
-            [{"red": 6, "blue": 1, "green": 3}, {"blue": 2, "red": 1, "green": 2}],
-        ),
-    ],
-)
-def test_parse_reveals(input_line, expected):
-    assert _parse_reveals(input_line) == expected
-
-
 def parse_line(input_line) -> (int, list[dict]):
     game_id_str, reveals_str = input_line.split(": ")
     game_id = _parse_game_id(game_id_str)
@@ -89,41 +42,327 @@ def parse_line(input_line) -> (int, list[dict]):
     return game_id, reveals
 
 
-def part_one_solver(data):
-    all_ids = set()
-    invalid_ids = set()
-    for line in data:
-        game_id, reveals = parse_line(line)
-        all_ids.add(game_id)
-        for reveal in reveals:
-            for color, number in reveal.items():
-                if number > PART_ONE_CUBE_LIMITS[color]:
-                    invalid_ids.add(game_id)
-                    # could do a breaking thing here but meh -- fast enough
-    return sum(all_ids - invalid_ids)
+class GameStore:
+    """Columnar store of parsed games.
 
+    Attributes:
+        game_ids:  int64 array of game IDs, one per game
+        maxima:  int32 array of shape (games, 3), the most cubes of each color
+            (in COLORS order) revealed at once in each game
+        reveal_games:  optional int64 array, the row in game_ids of each reveal
+        reveal_counts:  optional int32 array of shape (reveals, 3), the cubes
+            of each color shown in each reveal
+    """
 
-def test_part_one_solver():
-    data = read_input("test_input.txt")
-    assert part_one_solver(data) == 8
+    def __init__(self, game_ids, maxima, reveal_games=None, reveal_counts=None):
+        self.game_ids = game_ids
+        self.maxima = maxima
+        self.reveal_games = reveal_games
+        self.reveal_counts = reveal_counts
 
+    def __len__(self):
+        return len(self.game_ids)
 
-def part_two_solver(data):
-    powers = dict()
-    for line in data:
-        game_id, reveals = parse_line(line)
-        min_values = {}
-        for reveal in reveals:
-            for color, number in reveal.items():
-                if min_values.get(color) is None or number > min_values[color]:
-                    min_values[color] = number
-        line_power = functools.reduce(operator.mul, min_values.values(), 1)
-        powers[game_id] = line_power
-    return sum(powers.values())
+    @property
+    def max_red(self) -> np.ndarray:
+        return self.maxima[:, COLOR_INDEX["red"]]
+
+    @property
+    def max_green(self) -> np.ndarray:
+        return self.maxima[:, COLOR_INDEX["green"]]
+
+    @property
+    def max_blue(self) -> np.ndarray:
+        return self.maxima[:, COLOR_INDEX["blue"]]
+
+
+def _reveal_counts(reveals_str: str):
+    """Cubes of each color (in COLORS order) shown in each reveal of a game."""
+    for str_reveal in reveals_str.split("; "):
+        counts = [0, 0, 0]
+        for color_reveal in str_reveal.split(", "):
+            count, color = color_reveal.split(" ")
+            counts[COLOR_INDEX[color]] = int(count)
+        yield counts
+
+
+def _game_maxima(line: str, reveal_counts=None) -> (int, list[int]):
+    """The game ID of a line and the most cubes of each color (in COLORS
+    order) revealed at once in it. Each reveal's counts are also appended to
+    reveal_counts, if given.
+    """
+    game_id_str, reveals_str = line.split(": ")
+    line_maxima = [0, 0, 0]
+    for counts in _reveal_counts(reveals_str):
+        for idx in range(len(COLORS)):
+            if counts[idx] > line_maxima[idx]:
+                line_maxima[idx] = counts[idx]
+        if reveal_counts is not None:
+            reveal_counts.extend(counts)
+    return _parse_game_id(game_id_str), line_maxima
+
+
+def parse_games(data, keep_reveals=False) -> GameStore:
+    """Parse every game in one pass, straight into flat arrays.
+
+    Only the per-color maxima are kept unless keep_reveals is set, in which
+    case each reveal's counts are kept as well.
+    """
+    game_ids = array("q")
+    maxima = array("l")
+    reveal_games = array("q")
+    reveal_counts = array("l")
+    for row, line in enumerate(data):
+        before = len(reveal_counts)
+        game_id, line_maxima = _game_maxima(line, reveal_counts if keep_reveals else None)
+        game_ids.append(game_id)
+        maxima.extend(line_maxima)
+        if keep_reveals:
+            reveal_games.extend([row] * ((len(reveal_counts) - before) // len(COLORS)))
+
+    store = GameStore(
+        np.frombuffer(game_ids, dtype=np.int64),
+        np.array(maxima, dtype=np.int32).reshape(-1, len(COLORS)),
+    )
+    if keep_reveals:
+        store.reveal_games = np.frombuffer(reveal_games, dtype=np.int64)
+        store.reveal_counts = np.array(reveal_counts, dtype=np.int32).reshape(-1, len(COLORS))
+    return store
+
+
+# largest cumulative table FeasibilityIndex will build before it falls back
+# to scanning the games for every query
+MAX_INDEX_CELLS = 2**24
+
+
+class FeasibilityIndex:
+    """Answers "which games are possible with these cubes?" for many limits.
+
+    A game is feasible under limits (r, g, b) when its maxima are all within
+    them. The distinct maxima of each color are sorted, and a 3-D cumulative
+    table over them holds the sum and count of game IDs dominated by every
+    (r, g, b) corner. A query is then three binary searches and one table read,
+    independent of the number of games.
+    """
+
+    def __init__(self, store: GameStore):
+        self.store = store
+        # sorted distinct maxima per color; the table has a leading zero plane
+        # on every axis for limits below the smallest maximum
+        self.axes = [np.unique(store.maxima[:, idx]) for idx in range(len(COLORS))]
+        shape = tuple(len(axis) + 1 for axis in self.axes)
+        if np.prod(shape, dtype=np.int64) > MAX_INDEX_CELLS:
+            self.sums = self.counts = None
+            return
+        coords = tuple(
+            np.searchsorted(axis, store.maxima[:, idx]) + 1
+            for idx, axis in enumerate(self.axes)
+        )
+        self.sums = np.zeros(shape, dtype=np.int64)
+        self.counts = np.zeros(shape, dtype=np.int64)
+        np.add.at(self.sums, coords, store.game_ids)
+        np.add.at(self.counts, coords, 1)
+        for axis in range(len(COLORS)):
+            np.cumsum(self.sums, axis=axis, out=self.sums)
+            np.cumsum(self.counts, axis=axis, out=self.counts)
+
+    def query(self, limits) -> (np.ndarray, np.ndarray):
+        """Sum and count of feasible game IDs for each (red, green, blue) limit.
+
+        Args:
+            limits:  Sequence or array of shape (queries, 3), in COLORS order
+
+        Returns:
+            tuple of int64 arrays (sums, counts), one entry per query
+        """
+        limits = np.asarray(limits, dtype=np.int64).reshape(-1, len(COLORS))
+        if self.sums is None:
+            return self._scan(limits)
+        coords = tuple(
+            np.searchsorted(axis, limits[:, idx], side="right")
+            for idx, axis in enumerate(self.axes)
+        )
+        return self.sums[coords], self.counts[coords]
+
+    def _scan(self, limits) -> (np.ndarray, np.ndarray):
+        sums = np.zeros(len(limits), dtype=np.int64)
+        counts = np.zeros(len(limits), dtype=np.int64)
+        for idx, limit in enumerate(limits):
+            feasible = (self.store.maxima <= limit).all(axis=1)
+            sums[idx] = self.store.game_ids[feasible].sum()
+            counts[idx] = feasible.sum()
+        return sums, counts
+
+
+def feasible_id_sum(store: GameStore) -> int:
+    limits = np.array([PART_ONE_CUBE_LIMITS[color] for color in COLORS])
+    feasible = (store.maxima <= limits).all(axis=1)
+    return int(store.game_ids[feasible].sum())
+
+
+def total_power(store: GameStore) -> int:
+    # a color that never shows up doesn't count towards the power
+    minimum_cubes = np.where(store.maxima > 0, store.maxima, 1).astype(np.int64)
+    return int(minimum_cubes.prod(axis=1).sum())
 
 
-def test_part_two_solver():
-    assert part_two_solver(read_input('test_input.txt')) == 2286
+# bytes of a log GameLogFollower reads at a time
+TAIL_CHUNK_SIZE = 16 * 1024 * 1024
+
+# shortest time between two checkpoints written by GameLogFollower.follow
+CHECKPOINT_SECONDS = 60.0
+
+
+class GameLogFollower:
+    """Keeps both answers current for a game log that is only ever appended to.
+
+    Each poll reads the bytes appended since the last one and parses the
+    complete lines among them; a trailing partial line is left for the next
+    poll. The per-game maxima are kept, so the part one answer can be redone
+    for new limits without touching the log again. The byte offset, maxima and
+    running sums can be checkpointed to an .npz file so a restart picks up
+    where it left off. Lines that don't parse are skipped and counted in
+    skipped. If the log shrinks (it was truncated or replaced),
+    everything is thrown away and it is read again from the start.
+    """
+
+    def __init__(self, path, limits=PART_ONE_CUBE_LIMITS):
+        self.path = path
+        self.limits = [limits[color] for color in COLORS]
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self.game_ids = array("q")
+        self.maxima = array("q")
+        self.id_sum = 0
+        self.power_sum = 0
+        self.skipped = 0
+        self.bad_lines = []
+
+    def __len__(self):
+        return len(self.game_ids)
+
+    def _add_line(self, line: str):
+        game_id, line_maxima = _game_maxima(line)
+        self.game_ids.append(game_id)
+        self.maxima.extend(line_maxima)
+        if all(most <= limit for most, limit in zip(line_maxima, self.limits)):
+            self.id_sum += game_id
+        # same per-game power as total_power
+        red, green, blue = (most or 1 for most in line_maxima)
+        self.power_sum += red * green * blue
+
+    def poll(self, chunk_size=TAIL_CHUNK_SIZE) -> int:
+        """Parse whatever has been appended to the log; returns the number of new games.
+
+        The new bytes are read chunk_size at a time, carrying any partial last
+        line over into the next chunk, so a long unread tail is never held in
+        memory all at once. The offset moves past each line as it is handled,
+        so a line is never counted twice. A line that isn't a game is skipped
+        rather than stopping the follower; the ones skipped by this poll are
+        left in bad_lines as (byte offset, text) pairs.
+        """
+        if os.path.getsize(self.path) < self.offset:
+            self._reset()
+        before = len(self)
+        self.bad_lines = []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            carry = b""
+            while chunk := f.read(chunk_size):
+                *lines, carry = (carry + chunk).split(b"\n")
+                for raw in lines:
+                    line = raw.strip()
+                    if line:
+                        try:
+                            self._add_line(line.decode())
+                        except (ValueError, KeyError, AssertionError):
+                            self.bad_lines.append((self.offset, raw.decode(errors="replace")))
+                            self.skipped += 1
+                    self.offset += len(raw) + 1
+        return len(self) - before
+
+    def follow(self, interval=1.0, checkpoint=None, checkpoint_seconds=CHECKPOINT_SECONDS):
+        """Poll forever, yielding after every poll that found new games or bad lines.
+
+        A checkpoint rewrites every game seen, so it is saved at most once per
+        checkpoint_seconds, plus once more when the generator is closed.
+        """
+        saved_at = time.monotonic()
+        unsaved = False
+        try:
+            while True:
+                if self.poll() or self.bad_lines:
+                    unsaved = True
+                    if checkpoint and time.monotonic() - saved_at >= checkpoint_seconds:
+                        self.save(checkpoint)
+                        saved_at = time.monotonic()
+                        unsaved = False
+                    yield self
+                else:
+                    time.sleep(interval)
+        finally:
+            if checkpoint and unsaved:
+                self.save(checkpoint)
+
+    def store(self) -> GameStore:
+        """The games seen so far, as the arrays the batch solvers take."""
+        return GameStore(
+            np.frombuffer(self.game_ids, dtype=np.int64),
+            np.frombuffer(self.maxima, dtype=np.int64).reshape(-1, len(COLORS)),
+        )
+
+    def set_limits(self, limits):
+        """Redo part one for new cube limits, from the kept maxima."""
+        self.limits = [limits[color] for color in COLORS]
+        store = self.store()
+        feasible = (store.maxima <= np.array(self.limits)).all(axis=1)
+        self.id_sum = int(store.game_ids[feasible].sum())
+
+    def answer(self, mode) -> int:
+        return self.id_sum if mode == 1 else self.power_sum
+
+    def save(self, checkpoint):
+        """Write the follower's state to an .npz checkpoint, atomically."""
+        staging = f"{checkpoint}.tmp"
+        with open(staging, "wb") as f:
+            np.savez(
+                f,
+                offset=self.offset,
+                game_ids=np.frombuffer(self.game_ids, dtype=np.int64),
+                maxima=np.frombuffer(self.maxima, dtype=np.int64),
+                limits=np.array(self.limits),
+                sums=np.array([self.id_sum, self.power_sum]),
+                skipped=self.skipped,
+            )
+        os.replace(staging, checkpoint)
+
+    @classmethod
+    def resume(cls, path, checkpoint, limits=PART_ONE_CUBE_LIMITS):
+        """A follower for path, restored from checkpoint if it exists."""
+        follower = cls(path, limits)
+        if not os.path.exists(checkpoint):
+            return follower
+        with np.load(checkpoint) as saved:
+            follower.offset = int(saved["offset"])
+            follower.game_ids = array("q", saved["game_ids"].tobytes())
+            follower.maxima = array("q", saved["maxima"].tobytes())
+            follower.id_sum, follower.power_sum = (int(value) for value in saved["sums"])
+            saved_limits = saved["limits"].tolist()
+            # checkpoints written before bad lines were skipped don't have a count
+            follower.skipped = int(saved["skipped"]) if "skipped" in saved else 0
+        if saved_limits != follower.limits:
+            follower.set_limits(limits)
+        return follower
+
+
+def part_one_solver(data):
+    return feasible_id_sum(parse_games(data))
+
+
+def part_two_solver(data):
+    return total_power(parse_games(data))
 
 
 def read_input(input_file):
@@ -135,6 +374,24 @@ def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument("input_file")
     parser.add_argument("mode", type=int, default=1)
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="tail the log, printing the answer whenever games are appended",
+    )
+    parser.add_argument("--checkpoint", help="with --follow, resume from and save state to this .npz file")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between polls of an idle log")
+    parser.add_argument(
+        "--checkpoint-seconds",
+        type=float,
+        default=CHECKPOINT_SECONDS,
+        help="with --follow and --checkpoint, shortest time between two checkpoints",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="with --follow, read what has been appended since the checkpoint and exit",
+    )
     return parser.parse_args()
 
 
@@ -143,9 +400,68 @@ MODE_MAP = {
     2: part_two_solver,
 }
 
+parse_input = parse_games
+
+# bump whenever parse_input's output changes, so cached parses are rebuilt
+PARSER_VERSION = 1
+
+
+def dump_parsed(store: GameStore) -> dict:
+    """Arrays to cache for the output of parse_input."""
+    return {name: value for name, value in vars(store).items() if value is not None}
+
+
+def load_parsed(arrays) -> GameStore:
+    return GameStore(**arrays)
+
+# the helpers the solvers spend their time in, which python -m aoc counts and
+# times when profiling is on (see aoc.profiling)
+HOT_FUNCTIONS = (
+    "parse_games",
+    "_game_maxima",
+    "_reveal_counts",
+    "_parse_game_id",
+    "feasible_id_sum",
+    "total_power",
+    "FeasibilityIndex.query",
+    "GameLogFollower._add_line",
+)
+
+# solvers that take the output of parse_input
+SOLVERS = {
+    1: feasible_id_sum,
+    2: total_power,
+}
+
+
+def _report_bad_lines(follower: GameLogFollower):
+    for offset, line in follower.bad_lines:
+        print(f"skipped a line that isn't a game at byte {offset}: {line!r}", file=sys.stderr)
+
 
 def main():
     args = parse_args()
+    if args.follow:
+        if args.checkpoint:
+            follower = GameLogFollower.resume(args.input_file, args.checkpoint)
+        else:
+            follower = GameLogFollower(args.input_file)
+        if args.once:
+            follower.poll()
+            _report_bad_lines(follower)
+            if args.checkpoint:
+                follower.save(args.checkpoint)
+            print(follower.answer(args.mode))
+            return
+        updates = follower.follow(args.interval, args.checkpoint, args.checkpoint_seconds)
+        try:
+            for follower in updates:
+                _report_bad_lines(follower)
+                print(follower.answer(args.mode), flush=True)
+        except KeyboardInterrupt:
+            # closing the generator writes any unsaved checkpoint
+            updates.close()
+        return
     data = read_input(args.input_file)
     func = MODE_MAP.get(args.mode)
     if not func:
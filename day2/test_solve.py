@@ -0,0 +1,160 @@
+import numpy as np
+import pytest
+
+from solve import (
+    FeasibilityIndex,
+    GameLogFollower,
+    _parse_game_id,
+    _parse_reveals,
+    feasible_id_sum,
+    parse_games,
+    part_one_solver,
+    part_two_solver,
+    read_input,
+    total_power,
+)
+
+
+@pytest.mark.parametrize(
+    "input_line, expected",
+    [
+        ("Game 1", 1),
+        ("Game 2", 2),
+        ("Game 3", 3),
+    ],
+)
+def test_parse_game_id(input_line, expected):
+    assert _parse_game_id(input_line) == expected
+
+
+@pytest.mark.parametrize(
+    "input_line, expected",
+    [
+        (
+            "3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green",
+            [{"blue": 3, "red": 4}, {"red": 1, "green": 2, "blue": 6}, {"green": 2}],
+        ),
+        (
+            "1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue",
+            [
+                {"blue": 1, "green": 2},
+                {"green": 3, "blue": 4, "red": 1},
+                {"green": 1, "blue": 1},
+            ],
+        ),
+        (
+            "8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green; 5 green, 1 red",
+            [
+                {"green": 8, "blue": 6, "red": 20},
+                {"blue": 5, "red": 4, "green": 13},
+                {"green": 5, "red": 1},
+            ],
+        ),
+        (
+            "1 green, 3 red, 6 blue; 3 green, 6 red; 3 green, 15 blue, 14 red",
+            [
+                {"green": 1, "red": 3, "blue": 6},
+                {"green": 3, "red": 6},
+                {"green": 3, "blue": 15, "red": 14},
+            ],
+        ),
+        (
+            "6 red, 1 blue, 3 green; 2 blue, 1 red, 2 green",
+            [{"red": 6, "blue": 1, "green": 3}, {"blue": 2, "red": 1, "green": 2}],
+        ),
+    ],
+)
+def test_parse_reveals(input_line, expected):
+    assert _parse_reveals(input_line) == expected
+
+
+def test_parse_games():
+    store = parse_games(read_input("test_input.txt"), keep_reveals=True)
+    assert store.game_ids.tolist() == [1, 2, 3, 4, 5]
+    assert store.max_red.tolist() == [4, 1, 20, 14, 6]
+    assert store.max_green.tolist() == [2, 3, 13, 3, 3]
+    assert store.max_blue.tolist() == [6, 4, 6, 15, 2]
+    assert store.reveal_games.tolist() == [0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4]
+    assert store.reveal_counts[:3].tolist() == [[4, 0, 3], [1, 2, 6], [0, 2, 0]]
+    assert parse_games(read_input("test_input.txt")).reveal_counts is None
+
+
+def test_feasibility_index():
+    store = parse_games(read_input("input.txt"))
+    index = FeasibilityIndex(store)
+    limits = [(r, g, b) for r in range(0, 22, 3) for g in range(0, 22, 2) for b in (0, 5, 14, 30)]
+    sums, counts = index.query(limits)
+    scan_sums, scan_counts = index._scan(np.array(limits))
+    assert sums.tolist() == scan_sums.tolist()
+    assert counts.tolist() == scan_counts.tolist()
+    sums, counts = index.query([(12, 13, 14)])
+    assert sums.tolist() == [part_one_solver(read_input("input.txt"))]
+
+
+def test_part_one_solver():
+    data = read_input("test_input.txt")
+    assert part_one_solver(data) == 8
+
+
+def test_part_two_solver():
+    assert part_two_solver(read_input('test_input.txt')) == 2286
+
+
+def test_game_log_follower(tmp_path):
+    with open("test_input.txt", "rb") as f:
+        log = f.read()
+    path = tmp_path / "games.log"
+    checkpoint = tmp_path / "games.npz"
+    # stop part way through game 3, which has to wait for the rest of its line
+    cut = log.index(b"Game 3") + 10
+    path.write_bytes(log[:cut])
+    follower = GameLogFollower(path)
+    assert follower.poll() == 2
+    assert (follower.id_sum, follower.power_sum) == (3, 48 + 12)
+    follower.save(checkpoint)
+
+    with open(path, "ab") as f:
+        f.write(log[cut:])
+    follower = GameLogFollower.resume(path, checkpoint)
+    # chunks shorter than a line have to be carried over, sometimes twice
+    assert follower.poll(chunk_size=16) == 3
+    assert follower.poll() == 0
+    assert (follower.answer(1), follower.answer(2)) == (8, 2286)
+    store = follower.store()
+    assert feasible_id_sum(store) == 8 and total_power(store) == 2286
+
+    follower.set_limits({"red": 20, "green": 13, "blue": 6})
+    assert follower.id_sum == 1 + 2 + 3 + 5
+
+    path.write_bytes(log[: log.index(b"Game 2")])
+    assert follower.poll() == 1
+    assert follower.id_sum == 1
+
+
+def test_game_log_follower_checkpoints_on_close(tmp_path):
+    path = tmp_path / "games.log"
+    checkpoint = tmp_path / "games.npz"
+    with open("test_input.txt", "rb") as f:
+        path.write_bytes(f.read())
+    updates = GameLogFollower(path).follow(interval=0, checkpoint=checkpoint, checkpoint_seconds=3600)
+    assert len(next(updates)) == 5
+    # too soon for a checkpoint, until the generator is closed
+    assert not checkpoint.exists()
+    updates.close()
+    assert GameLogFollower.resume(path, checkpoint).answer(2) == 2286
+
+
+def test_game_log_follower_skips_bad_lines(tmp_path):
+    path = tmp_path / "games.log"
+    checkpoint = tmp_path / "games.npz"
+    path.write_bytes(b"Game 1: 3 blue\nGame 2 oops\nGame 3: 2 red\n")
+    follower = GameLogFollower(path)
+    # chunk boundaries land inside the bad line too
+    assert follower.poll(chunk_size=8) == 2
+    assert follower.bad_lines == [(15, "Game 2 oops")]
+    assert follower.poll() == 0
+    assert (len(follower), follower.id_sum, follower.skipped) == (2, 4, 1)
+    assert follower.offset == path.stat().st_size
+    assert follower.bad_lines == []
+    follower.save(checkpoint)
+    assert GameLogFollower.resume(path, checkpoint).skipped == 1
@@ -1,6 +1,16 @@
 import argparse
-import pytest
-import functools
+import numpy as np
+import os
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+# the repo root, so a day run from its own directory can import the helpers
+# it shares with other days from the aoc package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc.digits import digit_runs  # noqa: E402
 
 
 # (horizontal, vertical)
@@ -18,8 +28,19 @@ def read_input(input_file) -> list[str]:
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Solve the problem")
-    parser.add_argument("input_file", type=str, help="input file")
+    parser.add_argument("input_file", type=str, help="input file, or - for stdin")
     parser.add_argument("mode", type=int, help="part one or part two")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="read rows one at a time, keeping only three rows in memory",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="split the grid into bands and solve them on this many processes",
+    )
+    parser.add_argument("--band-rows", type=int, help="rows per band in --workers mode")
     args = parser.parse_args()
     return args
 
@@ -52,12 +73,6 @@ def is_part_number(row: int, col: int, length: int, data: list) -> bool:
     return False
 
 
-def test_is_part_number():
-    data = read_input("test_input.txt")
-    assert is_part_number(0, 0, 3, data) is True  # 467 in row 1
-    assert is_part_number(0, 5, 3, data) is False  # 114 in row 1
-
-
 def get_next_number(input_line: str, start_search_at: int) -> (str, int, int):
     """
     Scan an input line for a number, starting at the given index.
@@ -107,61 +122,109 @@ def get_next_number(input_line: str, start_search_at: int) -> (str, int, int):
     return None, None, None
 
 
-def test_get_next_number():
-    input_str = "467..114.."
-    part_number, start_col, end_col = get_next_number(input_str, 0)
-    assert part_number == "467"
-    assert start_col == 0
-    assert end_col == 3
-    part_number, start_col, end_col = get_next_number(input_str, end_col)
-    assert part_number == "114"
-    assert start_col == 5
-    assert end_col == 8
-    part_number, start_col, end_col = get_next_number(input_str, end_col)
-    assert part_number is None
-    assert start_col is None
-    assert end_col is None
-    long_input_str = ".....510"
-    part_number, start_col, end_col = get_next_number(long_input_str, 0)
-    assert part_number == "510"
-    assert start_col == 5
-    assert end_col == 8
-    single_end_input_str = ".1.1"
-    part_number, start_col, end_col = get_next_number(single_end_input_str, 0)
-    assert part_number == "1"
-    assert start_col == 1
-    assert end_col == 2
-    part_number, start_col, end_col = get_next_number(single_end_input_str, end_col)
-    assert part_number == "1"
-    assert start_col == 3
-    assert end_col == 4
+def load_grid(data: list) -> np.ndarray:
+    """Load the schematic into a 2-D uint8 array of its characters.
 
+    Short rows are padded with "." so the grid is always rectangular.
+    """
+    width = max((len(line) for line in data), default=0)
+    raw = "".join(line.ljust(width, ".") for line in data).encode()
+    return np.frombuffer(raw, dtype=np.uint8).reshape(len(data), width)
+
+
+def symbol_mask(grid: np.ndarray) -> np.ndarray:
+    """Vectorized is_symbol over the whole grid."""
+    digits = (grid >= ord("0")) & (grid <= ord("9"))
+    letters = ((grid | 0x20) >= ord("a")) & ((grid | 0x20) <= ord("z"))
+    return (grid != ord(".")) & ~digits & ~letters
+
+
+def dilate(mask: np.ndarray) -> np.ndarray:
+    """Grow a boolean mask by one cell in all eight directions."""
+    height, width = mask.shape
+    padded = np.zeros((height + 2, width + 2), dtype=bool)
+    padded[1:-1, 1:-1] = mask
+    dilated = np.zeros_like(mask)
+    for row_d in (-1, 0, 1):
+        for col_d in (-1, 0, 1):
+            dilated |= padded[1 + row_d : 1 + row_d + height, 1 + col_d : 1 + col_d + width]
+    return dilated
+
+
+def find_numbers(grid: np.ndarray) -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+    """Find every number in the grid without a per-character loop.
+
+    Returns:
+        tuple of int64 arrays, one entry per number, in reading order:
+            row
+            start column
+            end column (exclusive)
+            value
+    """
+    height, width = grid.shape
+    # a trailing non-digit column keeps numbers from wrapping onto the next row
+    padded = np.full((height, width + 1), ord("."), dtype=np.uint8)
+    padded[:, :width] = grid
+    starts, ends, values = digit_runs(padded.ravel())
+    rows = starts // (width + 1)
+    return rows, starts - rows * (width + 1), ends - rows * (width + 1), values
 
-def part_one_solution(data):
-    # track all the part numbers we find along the way
-    part_numbers = list()
-
-    for ridx in range(0, len(data)):
-        line = data[ridx]
-
-        # find each number in the row and check if its a part number
-        search_col = 0
-        while search_col is not None:
-            number_str, start_col, next_search_col = get_next_number(line, search_col)
-            search_col = next_search_col
-            if number_str is not None and is_part_number(
-                ridx, start_col, len(number_str), data
-            ):
-                part_numbers.append(int(number_str))
 
-    return sum(part_numbers)
+def label_numbers(grid: np.ndarray) -> (np.ndarray, np.ndarray):
+    """Give every number in the grid an integer ID.
 
+    Returns:
+        tuple of:
+            int32 label grid, the same shape as grid; each digit cell holds the
+                ID of the number it belongs to, every other cell holds -1
+            int64 array of number values, indexed by ID
+    """
+    rows, start_cols, end_cols, values = find_numbers(grid)
+    labels = np.full(grid.shape, -1, dtype=np.int32)
+    lengths = end_cols - start_cols
+    ids = np.repeat(np.arange(len(values), dtype=np.int32), lengths)
+    # column of every digit cell: its number's start plus its offset in the run
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    labels[np.repeat(rows, lengths), np.repeat(start_cols, lengths) + offsets] = ids
+    return labels, values
+
+
+Schematic = namedtuple("Schematic", ["grid", "labels", "values"])
+
+
+def parse_input(data) -> Schematic:
+    grid = load_grid(data)
+    labels, values = label_numbers(grid)
+    return Schematic(grid, labels, values)
+
+
+# bump whenever parse_input's output changes, so cached parses are rebuilt
+PARSER_VERSION = 1
 
-def test_part_one_solution():
-    data = read_input("test_input.txt")
-    assert part_one_solution(data) == 4361 + 592 + 912  # added edge cases
-    # reddit data
-    data = read_input("test_input2.txt") == 413 + 1  # added edge cases
+
+def dump_parsed(schematic: Schematic) -> dict:
+    """Arrays to cache for the output of parse_input."""
+    return schematic._asdict()
+
+
+def load_parsed(arrays) -> Schematic:
+    return Schematic(**arrays)
+
+
+def part_number_sum(schematic: Schematic, row_range=None) -> int:
+    """Sum of the part numbers, or of those on rows start to end (exclusive)
+    when row_range is given."""
+    grid, labels, values = schematic
+    # a number is a part number if any of its cells touches the dilated mask
+    touching = dilate(symbol_mask(grid)) & (labels >= 0)
+    if row_range is not None:
+        start, end = row_range
+        touching[:start] = touching[end:] = False
+    return int(values[np.unique(labels[touching])].sum())
+
+
+def part_one_solution(data):
+    return part_number_sum(parse_input(data))
 
 
 def get_number_boundaries(row: int, col: int, data: list) -> (int, int):
@@ -179,18 +242,6 @@ def get_number_boundaries(row: int, col: int, data: list) -> (int, int):
     return start_col, end_col
 
 
-@pytest.mark.parametrize(
-    "row, col, expected",
-    [
-        (0, 1, (0, 2)),
-        (5, 7, (7, 8)),
-    ]
-)
-def test_get_number_boundaries(row, col, expected):
-    data = read_input("test_input.txt")
-    assert get_number_boundaries(row, col, data) == expected
-
-
 def get_contacted_parts(row: int, col: int, data: list) -> set[tuple]:
     """Given a point, determine the parts it contacts.
 
@@ -226,38 +277,155 @@ def get_contacted_parts(row: int, col: int, data: list) -> set[tuple]:
     return sorted(parts)  # for tests
 
 
-@pytest.mark.parametrize(
-    "row, col, expected",
-    [
-        (1, 3, [35, 467]),
-        (8, 5, [598, 755]),
-    ]
-)
-def test_get_contacted_parts(row, col, expected):
-    data = read_input("test_input.txt")
-    assert get_contacted_parts(row, col, data) == expected
+def gear_ratio_sum(schematic: Schematic, row_range=None) -> int:
+    """Sum of the gear ratios, or of those with the gear on rows start to end
+    (exclusive) when row_range is given."""
+    grid, labels, values = schematic
+    height, width = grid.shape
+    padded = np.full((height + 2, width + 2), -1, dtype=np.int32)
+    padded[1:-1, 1:-1] = labels
+
+    # the eight neighbouring labels of every star, one row per star
+    star_rows, star_cols = np.nonzero(grid == ord("*"))
+    if row_range is not None:
+        start, end = row_range
+        owned = (star_rows >= start) & (star_rows < end)
+        star_rows, star_cols = star_rows[owned], star_cols[owned]
+    neighbours = np.stack(
+        [padded[star_rows + 1 + row_d, star_cols + 1 + col_d] for col_d, row_d in VALID_DELTAS],
+        axis=1,
+    )
+
+    # de-duplicate IDs per star: after sorting, a new ID differs from its left
+    neighbours.sort(axis=1)
+    distinct = neighbours >= 0
+    distinct[:, 1:] &= neighbours[:, 1:] != neighbours[:, :-1]
+    gears = distinct.sum(axis=1) == 2
+    gear_parts = values[neighbours[gears][distinct[gears]]].reshape(-1, 2)
+    return int(gear_parts.prod(axis=1).sum())
 
 
 def part_two_solution(data):
-    ttl_ratio = 0
-    for ridx in range(0, len(data)):
-        line = data[ridx]
-        for cidx in range(0, len(line)):
-            char = line[cidx]
-            if char == '*':
-                contacted_parts = get_contacted_parts(ridx, cidx, data)
-                if len(contacted_parts) == 2:
-                    ratio = functools.reduce(lambda x, y: x * y, contacted_parts)
-                    ttl_ratio += ratio
-    return ttl_ratio
-
-
-def test_part_two_solution():
-    # data = read_input("test_input.txt")
-    # assert part_two_solution(data) == 467835
-    data = read_input("test_input2.txt")
-    print(data)
-    assert part_two_solution(data) == 6756
+    return gear_ratio_sum(parse_input(data))
+
+
+NUMBER_RE = re.compile(r"[0-9]+")
+# same rule as is_symbol, for ASCII schematics
+SYMBOL_RE = re.compile(r"[^.0-9A-Za-z]")
+
+# (number starts, number ends, number values, symbol columns, star columns)
+EMPTY_ROW = ((), (), (), (), ())
+
+
+def scan_row(line: str) -> tuple:
+    """Summarize one row for the streaming solver; all lists are sorted."""
+    starts, ends, values = [], [], []
+    for match in NUMBER_RE.finditer(line):
+        starts.append(match.start())
+        ends.append(match.end())
+        values.append(int(match.group()))
+    symbol_cols = [match.start() for match in SYMBOL_RE.finditer(line)]
+    star_cols = [col for col in symbol_cols if line[col] == "*"]
+    return starts, ends, values, symbol_cols, star_cols
+
+
+def _touches_symbol(row: tuple, start: int, end: int) -> bool:
+    """Is there a symbol in row between columns start - 1 and end?"""
+    symbol_cols = row[3]
+    idx = bisect_left(symbol_cols, start - 1)
+    return idx < len(symbol_cols) and symbol_cols[idx] <= end
+
+
+def _adjacent_numbers(row: tuple, col: int) -> list[int]:
+    """Values of the numbers in row that touch columns col - 1 to col + 1."""
+    starts, ends, values = row[:3]
+    found = []
+    idx = bisect_right(ends, col - 1)
+    while idx < len(starts) and starts[idx] <= col + 1:
+        found.append(values[idx])
+        idx += 1
+    return found
+
+
+def _window_events(ridx: int, prev: tuple, cur: tuple, nxt: tuple):
+    window = (prev, cur, nxt)
+    for start, end, value in zip(*cur[:3]):
+        if any(_touches_symbol(row, start, end) for row in window):
+            yield "part", ridx, value
+    for col in cur[4]:
+        parts = [value for row in window for value in _adjacent_numbers(row, col)]
+        if len(parts) == 2:
+            yield "gear", ridx, parts[0] * parts[1]
+
+
+def stream_events(rows):
+    """Find part numbers and gear ratios while reading rows one at a time.
+
+    Only a window of three summarized rows is kept. A row's results are known
+    as soon as the row after it arrives, so events are yielded while the input
+    is still being read.
+
+    Args:
+        rows:  iterable of schematic rows, e.g. a file object or sys.stdin
+
+    Yields:
+        tuples of ("part" or "gear", row index, part number or gear ratio)
+    """
+    prev = cur = EMPTY_ROW
+    ridx = -1
+    for line in rows:
+        nxt = scan_row(line.strip())
+        if ridx >= 0:
+            yield from _window_events(ridx, prev, cur, nxt)
+        prev, cur, ridx = cur, nxt, ridx + 1
+    if ridx >= 0:
+        yield from _window_events(ridx, prev, cur, EMPTY_ROW)
+
+
+STREAM_EVENTS = {
+    1: "part",
+    2: "gear",
+}
+
+
+def stream_solution(rows, mode) -> int:
+    kind = STREAM_EVENTS[mode]
+    return sum(value for event, _, value in stream_events(rows) if event == kind)
+
+
+def band_solution(rows: list, mode: int, owned_start: int, owned_end: int) -> int:
+    """Partial answer for one horizontal band of the grid.
+
+    rows includes a halo row above and below the band (where the grid has
+    them), so every owned row sees all its neighbours. The band is labelled
+    and solved with the same vectorized solvers as the whole grid, but only
+    numbers and gears on rows owned_start to owned_end (exclusive, relative
+    to rows) are counted.
+    """
+    return SOLVERS[mode](parse_input(rows), (owned_start, owned_end))
+
+
+def parallel_solution(data, mode, workers=None, band_rows=None) -> int:
+    """Solve bands of the grid on a process pool and add up the partial sums."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count()
+    band_rows = band_rows or max(1, -(-len(data) // workers))
+    with ProcessPoolExecutor(workers) as pool:
+        futures = []
+        for start in range(0, len(data), band_rows):
+            end = min(start + band_rows, len(data))
+            halo_start = max(start - 1, 0)
+            futures.append(
+                pool.submit(
+                    band_solution,
+                    data[halo_start : end + 1],
+                    mode,
+                    start - halo_start,
+                    end - halo_start,
+                )
+            )
+        return sum(future.result() for future in futures)
 
 
 MODE_MAP = {
@@ -265,10 +433,42 @@ MODE_MAP = {
     2: part_two_solution,
 }
 
+# the helpers the solvers spend their time in, which python -m aoc counts and
+# times when profiling is on (see aoc.profiling)
+HOT_FUNCTIONS = (
+    "load_grid",
+    "label_numbers",
+    "find_numbers",
+    "digit_runs",
+    "symbol_mask",
+    "dilate",
+    "part_number_sum",
+    "gear_ratio_sum",
+    "stream_events",
+    "scan_row",
+    "band_solution",
+)
+
+# solvers that take the output of parse_input
+SOLVERS = {
+    1: part_number_sum,
+    2: gear_ratio_sum,
+}
+
 
 def main():
     args = parse_args()
+    if args.stream:
+        if args.input_file == "-":
+            print(stream_solution(sys.stdin, args.mode))
+        else:
+            with open(args.input_file) as f:
+                print(stream_solution(f, args.mode))
+        return
     data = read_input(args.input_file)
+    if args.workers:
+        print(parallel_solution(data, args.mode, args.workers, args.band_rows))
+        return
     func = MODE_MAP[args.mode]
     print(func(data))
 
@@ -0,0 +1,160 @@
+import io
+import numpy as np
+import pytest
+
+from solve import (
+    MODE_MAP,
+    band_solution,
+    dilate,
+    find_numbers,
+    get_contacted_parts,
+    get_next_number,
+    get_number_boundaries,
+    is_part_number,
+    label_numbers,
+    load_grid,
+    parallel_solution,
+    part_one_solution,
+    part_two_solution,
+    read_input,
+    stream_events,
+    stream_solution,
+)
+
+
+def test_is_part_number():
+    data = read_input("test_input.txt")
+    assert is_part_number(0, 0, 3, data) is True  # 467 in row 1
+    assert is_part_number(0, 5, 3, data) is False  # 114 in row 1
+
+
+def test_get_next_number():
+    input_str = "467..114.."
+    part_number, start_col, end_col = get_next_number(input_str, 0)
+    assert part_number == "467"
+    assert start_col == 0
+    assert end_col == 3
+    part_number, start_col, end_col = get_next_number(input_str, end_col)
+    assert part_number == "114"
+    assert start_col == 5
+    assert end_col == 8
+    part_number, start_col, end_col = get_next_number(input_str, end_col)
+    assert part_number is None
+    assert start_col is None
+    assert end_col is None
+    long_input_str = ".....510"
+    part_number, start_col, end_col = get_next_number(long_input_str, 0)
+    assert part_number == "510"
+    assert start_col == 5
+    assert end_col == 8
+    single_end_input_str = ".1.1"
+    part_number, start_col, end_col = get_next_number(single_end_input_str, 0)
+    assert part_number == "1"
+    assert start_col == 1
+    assert end_col == 2
+    part_number, start_col, end_col = get_next_number(single_end_input_str, end_col)
+    assert part_number == "1"
+    assert start_col == 3
+    assert end_col == 4
+
+
+def test_dilate():
+    mask = np.zeros((3, 4), dtype=bool)
+    mask[0, 0] = True
+    assert dilate(mask).astype(int).tolist() == [[1, 1, 0, 0], [1, 1, 0, 0], [0, 0, 0, 0]]
+
+
+def test_find_numbers():
+    grid = load_grid(["467..114..", "...*.....1", "2........."])
+    rows, start_cols, end_cols, values = find_numbers(grid)
+    assert rows.tolist() == [0, 0, 1, 2]
+    assert start_cols.tolist() == [0, 5, 9, 0]
+    assert end_cols.tolist() == [3, 8, 10, 1]
+    assert values.tolist() == [467, 114, 1, 2]
+
+
+def test_label_numbers():
+    labels, values = label_numbers(load_grid(["467..114..", "...*.....1"]))
+    assert labels.tolist() == [
+        [0, 0, 0, -1, -1, 1, 1, 1, -1, -1],
+        [-1, -1, -1, -1, -1, -1, -1, -1, -1, 2],
+    ]
+    assert values.tolist() == [467, 114, 1]
+
+
+def test_part_one_solution():
+    data = read_input("test_input.txt")
+    assert part_one_solution(data) == 4361 + 592 + 912  # added edge cases
+    # reddit data
+    data = read_input("test_input2.txt") == 413 + 1  # added edge cases
+
+
+@pytest.mark.parametrize(
+    "row, col, expected",
+    [
+        (0, 1, (0, 2)),
+        (5, 7, (7, 8)),
+    ]
+)
+def test_get_number_boundaries(row, col, expected):
+    data = read_input("test_input.txt")
+    assert get_number_boundaries(row, col, data) == expected
+
+
+@pytest.mark.parametrize(
+    "row, col, expected",
+    [
+        (1, 3, [35, 467]),
+        (8, 5, [598, 755]),
+    ]
+)
+def test_get_contacted_parts(row, col, expected):
+    data = read_input("test_input.txt")
+    assert get_contacted_parts(row, col, data) == expected
+
+
+def test_part_two_solution():
+    # data = read_input("test_input.txt")
+    # assert part_two_solution(data) == 467835
+    data = read_input("test_input2.txt")
+    print(data)
+    assert part_two_solution(data) == 6756
+
+
+@pytest.mark.parametrize(
+    "input_file, mode",
+    [
+        ("test_input.txt", 1),
+        ("test_input.txt", 2),
+        ("test_input2.txt", 1),
+        ("test_input2.txt", 2),
+        ("input.txt", 1),
+        ("input.txt", 2),
+    ]
+)
+def test_stream_solution(input_file, mode):
+    with open(input_file) as f:
+        assert stream_solution(f, mode) == MODE_MAP[mode](read_input(input_file))
+
+
+def test_stream_events():
+    rows = io.StringIO("467..114..\n...*......\n..35..633.\n")
+    events = stream_events(rows)
+    # row 0 is settled as soon as row 1 has been read
+    assert next(events) == ("part", 0, 467)
+    assert rows.tell() == len("467..114..\n...*......\n")
+    assert list(events) == [("gear", 1, 467 * 35), ("part", 2, 35)]
+
+
+@pytest.mark.parametrize("band_rows", [1, 2, 5, None])
+def test_parallel_solution(band_rows):
+    data = read_input("test_input.txt")
+    assert parallel_solution(data, 1, workers=2, band_rows=band_rows) == part_one_solution(data)
+    assert parallel_solution(data, 2, workers=2, band_rows=band_rows) == part_two_solution(data)
+
+
+def test_band_solution():
+    data = read_input("test_input.txt")
+    # rows 1 and 2 of the grid, with rows 0 and 3 as halo
+    assert band_solution(data[0:4], 1, 1, 3) == 35 + 633
+    assert band_solution(data[0:4], 2, 1, 3) == 467 * 35
@@ -1,7 +1,23 @@
 import argparse
-import pytest
+import os
+import sys
 
-from collections import defaultdict
+import numpy as np
+
+# the repo root, so a day run from its own directory can import the helpers
+# it shares with other days from the aoc package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc.digits import digit_runs  # noqa: E402
+
+
+ZERO, NINE, COLON, PIPE, NEWLINE = b"09:|\n"
+
+# the batch path packs each side of a card into two uint64 words
+MAX_CARD_NUMBER = 127
+
+# number of set bits in every possible byte
+POPCOUNT_TABLE = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
 
 
 def parse_line(line) -> (set[int], set[int]):
@@ -12,69 +28,208 @@ def parse_line(line) -> (set[int], set[int]):
     return winning_nos, my_nos
 
 
-@pytest.mark.parametrize(
-    "line, expected",
-    [
-        ("Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53", ({41, 48, 83, 86, 17}, {83, 86, 6, 31, 17, 9, 48, 53})),
-        ("Card 2: 13 32 20 16 61 | 61 30 68 82 17 32 24 19", ({13, 32, 20, 16, 61}, {61, 30, 68, 82, 17, 32, 24, 19})),
-        # ("Card 3:  1 21 53 59 44 | 69 82 63 72 16 21 14  1",
-        # ("Card 4: 41 92 73 84 69 | 59 84 76 51 58  5 54 83",
-        # ("Card 5: 87 83 26 28 32 | 88 30 70 12 93 22 82 36",
-        # ("Card 6: 31 18 13 56 72 | 74 77 10 23 35 67 36 11",
-    ]
-)
-def test_parse_line(line, expected):
-    assert parse_line(line) == expected
+def parse_card_masks(line) -> (int, int):
+    """Parse a card straight into bitmasks of its winning numbers and my numbers.
+
+    Bit n of a mask is set when n is on that side of the card. The line is
+    walked byte by byte, so there's no splitting and no int() per number.
+    """
+    if isinstance(line, str):
+        line = line.encode()
+    masks = [0, 0]
+    side = 0
+    value = None
+    for byte in line[line.index(COLON) + 1 :]:
+        if ZERO <= byte <= NINE:
+            value = byte - ZERO if value is None else value * 10 + byte - ZERO
+            continue
+        if value is not None:
+            masks[side] |= 1 << value
+            value = None
+        if byte == PIPE:
+            side = 1
+    if value is not None:
+        masks[side] |= 1 << value
+    return masks[0], masks[1]
+
+
+def batch_match_counts(buf) -> np.ndarray:
+    """Number of winners on every card in a whole file's worth of bytes.
+
+    Numbers are found as runs of digits over the entire buffer, assigned to a
+    card and a side by the positions of the ":" and "|" separators, and or-ed
+    into a pair of uint64 words per side. The match count of a card is then
+    the popcount of its two sides and-ed together.
+
+    Args:
+        buf:  bytes-like contents of a scratchcard file
+
+    Returns:
+        int64 array with the number of winners on each card, in file order
+    """
+    raw = np.frombuffer(buf, dtype=np.uint8)
+    is_colon = raw == COLON
+    colons = np.flatnonzero(is_colon)
+    pipes = np.flatnonzero(raw == PIPE)
+    if len(colons) != len(pipes):
+        raise ValueError("every card needs exactly one ':' and one '|'")
+
+    starts, _, values = digit_runs(raw)
+
+    # a number belongs to the card of the last colon before it, unless it sits
+    # on a later line (that's the next card's own number); counting the colons
+    # and newlines up to every byte numbers the card and line it's on
+    cards = np.cumsum(is_colon, dtype=np.int32)[starts].astype(np.int64) - 1
+    lines = np.cumsum(raw == NEWLINE, dtype=np.int32)
+    same_line = (cards >= 0) & (lines[starts] == lines[colons[np.maximum(cards, 0)]])
+    del lines
+    cards, starts, values = cards[same_line], starts[same_line], values[same_line]
+    if len(values) and values.max() > MAX_CARD_NUMBER:
+        raise ValueError(f"card numbers must be at most {MAX_CARD_NUMBER}")
+    sides = (starts > pipes[cards]).astype(np.int64)
+
+    masks = np.zeros((len(colons), 2, 2), dtype=np.uint64)
+    bits = np.left_shift(np.uint64(1), (values & 63).astype(np.uint64))
+    np.bitwise_or.at(masks, (cards, sides, values >> 6), bits)
+    both = np.ascontiguousarray(masks[:, 0, :] & masks[:, 1, :])
+    return POPCOUNT_TABLE[both.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+def match_counts(data) -> np.ndarray:
+    """batch_match_counts for a list of input lines."""
+    return batch_match_counts("\n".join(data).encode())
 
 
 def parse_args():
     parser = argparse.ArgumentParser()
-    parser.add_argument('input_file', type=str, help='input file')
+    parser.add_argument('input_file', type=str, help='input file, or - for stdin')
     parser.add_argument('mode', type=int, help='output file')
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='score cards one at a time as they are read, e.g. from a growing log',
+    )
+    parser.add_argument(
+        '--every',
+        type=int,
+        default=0,
+        help='with --stream, also print the running total every N cards',
+    )
     return parser.parse_args()
 
 
 def number_of_winners(winning_nos, my_nos):
+    """Works on sets of numbers, or on the bitmasks from parse_card_masks."""
+    if isinstance(my_nos, int):
+        return (my_nos & winning_nos).bit_count()
     return len(my_nos.intersection(winning_nos))
 
 
-def solution_one(data):
-    ttl_value = 0
-    for line in data:
-        winning_nos, my_nos = parse_line(line)
-        winners = number_of_winners(winning_nos, my_nos)
-        if winners == 0:
-            continue
-        # doubling every time is the same as 2 ^ n - 1 (except 0)
-        value = 2 ** (winners - 1)
-        ttl_value += value
-    return ttl_value
+def total_points(winners) -> int:
+    """Part one answer, given the number of winners on each card."""
+    # doubling every time is the same as 2 ^ n - 1 (except 0); summed as
+    # python ints, since a card can win more than an int64 can hold
+    return sum(1 << (card_winners - 1) for card_winners in np.asarray(winners).tolist() if card_winners)
 
 
-def solution_two(data):
-    copy_counter = defaultdict(int)
-    for idx in range(0, len(data)):
-        line = data[idx]
-        winning_nos, my_nos = parse_line(line)
-        winners = number_of_winners(winning_nos, my_nos)
-        if winners == 0:
-            continue
-        # add copies of subsequent cards for each winner
-        for i in range(idx + 1, idx + 1 + winners):
-            # add one + the number of copies we've got of this card
-            num_copies = 1 + copy_counter[idx]
-            copy_counter[i] += num_copies
-    return sum(copy_counter.values()) + len(data)  # add the number of non-copies
+def total_cards(winners) -> int:
+    """Part two answer, given the number of winners on each card.
+
+    Copies only ever flow forward, so a running difference array is enough:
+    each card adds its copy count to the start of the range of cards it wins
+    and takes it back off just past the end. Each card costs O(1) however many
+    winners it has.
+    """
+    winners = np.asarray(winners, dtype=np.int64).tolist()
+    num_cards = len(winners)
+    diff = [0] * (num_cards + 1)
+    running = 0
+    total = 0
+    for idx, card_winners in enumerate(winners):
+        running += diff[idx]
+        copies = 1 + running  # the original plus every copy won so far
+        total += copies
+        if card_winners:
+            diff[idx + 1] += copies
+            diff[min(idx + 1 + card_winners, num_cards)] -= copies
+    return total
 
 
-def test_solution_two():
-    data = read_input('test_input.txt')
-    assert solution_two(data) == 30
+class ScratchcardTally:
+    """Running answers for both parts, fed one card at a time.
 
+    Copies only ever flow forward, and never further than a card's number of
+    winners, so the only state kept is a ring of difference-array entries
+    (see total_cards) for the next max-winners cards. The ring grows if a card
+    wins more than it can hold. Cards that would be won past the last card
+    fed never arrive, so they're never counted, same as total_cards.
+    """
 
-def test_solution_one():
-    data = read_input("test_input.txt")
-    assert solution_one(data) == 13
+    def __init__(self, max_winners=10):
+        self.points = 0
+        self.cards = 0
+        self.seen = 0
+        self._running = 0
+        self._diff = [0] * (max_winners + 1)
+
+    def _grow(self, max_winners):
+        size = len(self._diff)
+        diff = [0] * (max_winners + 1)
+        for offset in range(size):
+            diff[(self.seen + offset) % len(diff)] = self._diff[(self.seen + offset) % size]
+        self._diff = diff
+
+    def add(self, winners: int) -> int:
+        """Score the next card, given its number of winners; returns its copy count."""
+        if winners >= len(self._diff):
+            self._grow(winners)
+        diff = self._diff
+        size = len(diff)
+        slot = self.seen % size
+        self._running += diff[slot]
+        diff[slot] = 0
+        copies = 1 + self._running
+        if winners:
+            self.points += 1 << (winners - 1)
+            diff[(slot + 1) % size] += copies
+            diff[(slot + 1 + winners) % size] -= copies
+        self.cards += copies
+        self.seen += 1
+        return copies
+
+    def add_line(self, line) -> int:
+        winning_nos, my_nos = parse_card_masks(line)
+        return self.add(number_of_winners(winning_nos, my_nos))
+
+    def consume(self, lines):
+        """Feed every card from a file object, pipe or other iterable of lines.
+
+        Yields the tally after each card, so callers can report as they go.
+        Blank lines are skipped.
+        """
+        for line in lines:
+            if line.strip():
+                self.add_line(line)
+                yield self
+
+    def answer(self, mode) -> int:
+        return self.points if mode == 1 else self.cards
+
+
+def stream_solution(lines, mode, every=0) -> int:
+    tally = ScratchcardTally()
+    for tally in tally.consume(lines):
+        if every and tally.seen % every == 0:
+            print(tally.answer(mode), flush=True)
+    return tally.answer(mode)
+
+
+def solution_one(data):
+    return total_points(match_counts(data))
+
+
+def solution_two(data):
+    return total_cards(match_counts(data))
 
 
 def read_input(input_file):
@@ -87,8 +242,47 @@ MODE_MAP = {
     2: solution_two,
 }
 
+parse_input = match_counts
+
+# bump whenever parse_input's output changes, so cached parses are rebuilt
+PARSER_VERSION = 1
+
+
+def dump_parsed(winners: np.ndarray) -> dict:
+    """Arrays to cache for the output of parse_input."""
+    return {"match_counts": winners}
+
+
+def load_parsed(arrays) -> np.ndarray:
+    return arrays["match_counts"]
+
+# the helpers the solvers spend their time in, which python -m aoc counts and
+# times when profiling is on (see aoc.profiling)
+HOT_FUNCTIONS = (
+    'batch_match_counts',
+    'digit_runs',
+    'total_points',
+    'total_cards',
+    'parse_card_masks',
+    'number_of_winners',
+    'ScratchcardTally.add',
+)
+
+# solvers that take the output of parse_input
+SOLVERS = {
+    1: total_points,
+    2: total_cards,
+}
+
 def main():
     args = parse_args()
+    if args.stream:
+        if args.input_file == '-':
+            print(stream_solution(sys.stdin, args.mode, args.every))
+        else:
+            with open(args.input_file) as f:
+                print(stream_solution(f, args.mode, args.every))
+        return
     func = MODE_MAP[args.mode]
     data = read_input(args.input_file)
     print(func(data))
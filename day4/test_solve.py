@@ -0,0 +1,99 @@
+import pytest
+
+from solve import (
+    ScratchcardTally,
+    batch_match_counts,
+    match_counts,
+    parse_card_masks,
+    parse_line,
+    read_input,
+    solution_one,
+    solution_two,
+    total_cards,
+    total_points,
+)
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53", ({41, 48, 83, 86, 17}, {83, 86, 6, 31, 17, 9, 48, 53})),
+        ("Card 2: 13 32 20 16 61 | 61 30 68 82 17 32 24 19", ({13, 32, 20, 16, 61}, {61, 30, 68, 82, 17, 32, 24, 19})),
+        # ("Card 3:  1 21 53 59 44 | 69 82 63 72 16 21 14  1",
+        # ("Card 4: 41 92 73 84 69 | 59 84 76 51 58  5 54 83",
+        # ("Card 5: 87 83 26 28 32 | 88 30 70 12 93 22 82 36",
+        # ("Card 6: 31 18 13 56 72 | 74 77 10 23 35 67 36 11",
+    ]
+)
+def test_parse_line(line, expected):
+    assert parse_line(line) == expected
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53",
+        "Card 3:  1 21 53 59 44 | 69 82 63 72 16 21 14  1",
+        b"Card 200: 0 7 | 7 127",
+    ]
+)
+def test_parse_card_masks(line):
+    winning_nos, my_nos = parse_line(line if isinstance(line, str) else line.decode())
+    assert parse_card_masks(line) == (sum(1 << n for n in winning_nos), sum(1 << n for n in my_nos))
+
+
+def test_batch_match_counts():
+    with open("test_input.txt", "rb") as f:
+        assert batch_match_counts(f.read()).tolist() == [4, 2, 2, 1, 0, 0]
+    assert batch_match_counts(b"Card 9: 1 64 127 | 127 2 64\nCard 10: 5 | 6").tolist() == [2, 0]
+    assert batch_match_counts(b"").tolist() == []
+    with pytest.raises(ValueError):
+        batch_match_counts(b"Card 1: 128 | 128")
+
+
+def test_total_cards():
+    assert total_cards([4, 2, 2, 1, 0, 0]) == 30
+    assert total_cards([]) == 0
+    assert total_cards([0, 0]) == 2
+    assert total_cards([1, 1, 1]) == 1 + 2 + 3
+    assert total_cards([2, 1, 0]) == 1 + 2 + 4
+
+
+@pytest.mark.parametrize(
+    "winners",
+    [[4, 2, 2, 1, 0, 0], [], [0, 0], [1, 1, 1], [2, 1, 0], [9, 0, 3, 12, 1, 1, 0, 5]],
+)
+def test_scratchcard_tally(winners):
+    # a ring of 2 has to grow for most of these
+    tally = ScratchcardTally(max_winners=1)
+    for card_winners in winners:
+        tally.add(card_winners)
+    assert (tally.points, tally.cards, tally.seen) == (total_points(winners), total_cards(winners), len(winners))
+
+
+def test_total_points_past_int64():
+    # numbers go up to 127, so a card can have up to 128 matches
+    line = "Card 1: " + " ".join(map(str, range(70))) + " | " + " ".join(map(str, range(70)))
+    winners = match_counts([line])
+    assert winners.tolist() == [70]
+    assert total_points(winners) == total_points([64, 70]) - 2**63 == 2**69
+    assert solution_one([line]) == 2**69
+    tally = ScratchcardTally()
+    tally.add(70)
+    assert tally.points == 2**69
+
+
+def test_scratchcard_tally_consume():
+    with open("test_input.txt") as f:
+        running = [tally.cards for tally in ScratchcardTally().consume(f)]
+    assert running == [1, 3, 7, 15, 29, 30]
+
+
+def test_solution_two():
+    data = read_input('test_input.txt')
+    assert solution_two(data) == 30
+
+
+def test_solution_one():
+    data = read_input("test_input.txt")
+    assert solution_one(data) == 13
@@ -0,0 +1,130 @@
+import mmap
+
+import numpy as np
+import pytest
+
+from solve import (
+    SectionMap,
+    TYPES,
+    compile_chain,
+    find_next_id,
+    get_seeds,
+    lowest_location,
+    lowest_location_of_ids,
+    map_ranges,
+    organize_data,
+    read_input,
+    resolve_ids,
+    solution_one,
+    solution_two,
+    stream_almanac,
+)
+
+
+def test_get_seeds():
+    assert get_seeds('seeds: 79 14 55 13') == [79, 14, 55, 13]
+
+
+def test_section_map():
+    section = SectionMap([(52, 50, 48), (50, 98, 2)])
+    assert list(section) == [(52, 50, 48), (50, 98, 2)]
+    assert len(section) == 2
+    assert section.lookup(49) == 49
+    assert section.lookup(50) == 52
+    assert section.lookup(99) == 51
+    assert section.lookup(100) == 100
+    assert list(section.pieces()) == [(50, 48, 2), (98, 2, -48)]
+    ids = np.array([0, 49, 50, 97, 98, 99, 100], dtype=np.int64)
+    assert section.lookup_batch(ids).tolist() == [section.lookup(x) for x in ids.tolist()]
+    assert SectionMap().lookup_batch(ids).tolist() == ids.tolist()
+
+
+def test_find_next_id():
+    data = read_input('test_input.txt')
+    data = organize_data(data[1:])
+    assert find_next_id(98, data['seed']) == 50
+    assert find_next_id(99, data['seed']) == 51
+    assert find_next_id(100, data['seed']) == 100  # end of range is exclusive
+
+
+def test_stream_almanac(monkeypatch):
+    expected = organize_data(read_input('test_input.txt')[1:])
+    # flush mid-section as well as at the end of each one
+    monkeypatch.setattr('solve.FLUSH_LINES', 2)
+    with open('test_input.txt') as f:
+        text = f.read()
+    with open('test_input.txt', 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        from_mmap = stream_almanac(buf)
+    sources = [text.splitlines(keepends=True), text.encode(), from_mmap]
+    for source in sources:
+        almanac = source if source is from_mmap else stream_almanac(source)
+        assert list(almanac.seeds) == [79, 14, 55, 13]
+        assert {mode: list(section) for mode, section in almanac.organized_data.items()} == {
+            mode: list(section) for mode, section in expected.items()
+        }
+
+
+def test_stream_almanac_blank_lines():
+    # organize_data used to spin forever on the first blank line
+    data = ['seed-to-soil map:', '', '50 98 2', '', '', 'soil-to-fertilizer map:', '0 15 37']
+    organized_data = organize_data(data)
+    assert list(organized_data['seed']) == [(50, 98, 2)]
+    assert list(organized_data['soil']) == [(0, 15, 37)]
+    with pytest.raises(ValueError):
+        stream_almanac(['seeds: 1', 'dirt-to-soil map:', '1 2 3'])
+    with pytest.raises(ValueError):
+        stream_almanac(['seeds: 1', 'seed-to-soil map:', '1 2'])
+    # six numbers in all, but not three to a line
+    with pytest.raises(ValueError, match="'1 2'"):
+        stream_almanac(['seed-to-soil map:', '1 2', '3 4 5 6'])
+    # three tokens, but not three numbers
+    for line in ('1 2 x', '1 2 -3'):
+        with pytest.raises(ValueError, match=repr(line)):
+            stream_almanac(['seed-to-soil map:', '50 98 2', line])
+        with pytest.raises(ValueError, match=repr(line)):
+            stream_almanac(f'seed-to-soil map:\n50 98 2\n{line}\n'.encode())
+
+
+@pytest.mark.parametrize(
+    "ranges, expected",
+    [
+        ([(79, 14)], [(81, 14)]),
+        ([(96, 6)], [(98, 2), (50, 2), (100, 2)]),
+        ([(0, 10)], [(0, 10)]),
+        ([(49, 2)], [(49, 1), (52, 1)]),
+    ]
+)
+def test_map_ranges(ranges, expected):
+    data = organize_data(read_input('test_input.txt')[1:])
+    assert map_ranges(ranges, data['seed']) == expected
+
+
+def test_compile_chain():
+    organized_data = organize_data(read_input('test_input.txt')[1:])
+    chain = compile_chain(organized_data)
+    for seed in range(0, 120):
+        last_id = seed
+        for this_type in TYPES[:-1]:
+            last_id = find_next_id(last_id, organized_data[this_type])
+        assert chain.lookup(seed) == last_id
+    assert [chain.lookup(seed) for seed in (79, 14, 55, 13)] == [82, 43, 86, 35]
+
+
+def test_resolve_ids():
+    organized_data = organize_data(read_input('test_input.txt')[1:])
+    assert resolve_ids([79, 14, 55, 13], organized_data).tolist() == [82, 43, 86, 35]
+    assert lowest_location_of_ids(np.arange(79, 79 + 14), organized_data) == 46
+    chain = compile_chain(organized_data)
+    assert lowest_location_of_ids(np.arange(55, 55 + 13), organized_data, chain) == 56
+
+
+def test_solution_one():
+    assert solution_one(read_input('test_input.txt')) == 35
+    # each seed is also just a range of length one
+    data = read_input('test_input.txt')
+    ranges = [(seed, 1) for seed in get_seeds(data[0])]
+    assert lowest_location(ranges, organize_data(data[1:])) == 35
+
+
+def test_solution_two():
+    assert solution_two(read_input('test_input.txt')) == 46